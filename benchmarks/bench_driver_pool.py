@@ -0,0 +1,46 @@
+# Compares selenium_tests wall-clock time with the warm driver pool vs a fresh browser per test
+#
+# Usage:
+#   python benchmarks/bench_driver_pool.py                       # whole selenium_tests folder
+#   python benchmarks/bench_driver_pool.py selenium_tests/test_tags.py -k clickable
+#
+# Test failures don't matter here (some tests are expected to fail), only the time it takes to run them
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "per-test launch": ["--no-driver-pool"],
+    "driver pool": [],
+}
+
+
+def run_suite(pytest_args, extra_args):
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *pytest_args, *extra_args]
+
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    pytest_args = argv or ["selenium_tests"]
+
+    results = {}
+    for mode, extra_args in MODES.items():
+        print(f"Running {' '.join(pytest_args)} with {mode}...")
+        results[mode] = run_suite(pytest_args, extra_args)
+
+    baseline = results["per-test launch"]
+    print()
+    print(f"{'mode':<20}{'seconds':>10}{'speed-up':>10}")
+    for mode, seconds in results.items():
+        print(f"{mode:<20}{seconds:>10.1f}{baseline / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,218 @@
+# Runs the same scenarios with Selenium and Playwright against the local mirror and compares them
+# Scenarios are the apps both folders implement, played with the test modules' own code: the pop-up (open ->
+# submit -> main text updated) and the tags input box (add a tag -> remove it with "X" -> "Remove All").
+#
+# Reports per scenario p50/p95 latency, browser startup time and memory of the browser processes, and
+# checks them against benchmarks/baseline.json - a metric more than --tolerance worse than the baseline
+# fails the run (exit code 1). Without a baseline the numbers are only printed, unless --check is given.
+#
+# Usage:
+#   python benchmarks/bench_frameworks.py                     # compare against the baseline
+#   python benchmarks/bench_frameworks.py --update-baseline   # store the current numbers as the new baseline
+#   python benchmarks/bench_frameworks.py --check             # in CI: no baseline is a failure too
+#   python benchmarks/bench_frameworks.py --runs 50 --framework playwright
+#
+# Memory is only measured when psutil is installed.
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from helpers.mirror import MirrorServer  # noqa: E402
+from helpers.site import SITE_URL_ENV  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def browser_memory_mb():
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    processes = psutil.Process().children(recursive=True)
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return round(total / 1024 / 1024, 1)
+
+
+# SCENARIOS #
+# The benchmark plays the test modules' own flows, so it measures what the suite actually does. The modules build
+# their BASE_URL when they're imported, which is why they're only imported once the mirror is up.
+
+class SeleniumRunner:
+    name = "selenium"
+
+    def start(self):
+        from helpers.driver_pool import launch_driver
+
+        self.driver = launch_driver("chrome", headless=True)
+
+    def stop(self):
+        self.driver.quit()
+
+    def popup(self):
+        from helpers.scenario import play
+
+        module = importlib.import_module("selenium_tests.test_pop_up_window")
+        self.driver.get(module.BASE_URL)
+        flow = play(module.open_and_submit_popup, self.driver)
+        module.test_text_on_the_main_page_is_what_is_expected(flow)
+
+    def tags(self):
+        module = importlib.import_module("selenium_tests.test_tags")
+        self.driver.get(module.BASE_URL)
+        module.test_tag_is_saved_and_displayed_after_entering_value(self.driver)
+        module.test_click_on_x_symbol_leads_to_removal_of_tag(self.driver)
+        module.test_click_on_remove_all_button_leads_to_removing_all_tags(self.driver)
+
+
+class PlaywrightRunner:
+    name = "playwright"
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=True)
+        self.context = self.browser.new_context()
+        self.page = self.context.new_page()
+
+    def stop(self):
+        self.browser.close()
+        self.playwright.stop()
+
+    def popup(self):
+        module = importlib.import_module("playwright_tests.test_pop_up_window")
+        self.page.goto(module.BASE_URL)
+        module.test_text_on_the_main_page_is_updated(self.page, self.context)
+
+    def tags(self):
+        module = importlib.import_module("playwright_tests.test_tags")
+        self.page.goto(module.BASE_URL)
+        module.test_tag_is_saved_and_displayed_after_entering_value(self.page)
+        module.test_click_on_x_symbol_leads_to_removal_of_tag(self.page)
+        module.test_click_on_remove_all_button_leads_to_removing_all_tags(self.page)
+
+
+RUNNERS = {"selenium": SeleniumRunner, "playwright": PlaywrightRunner}
+SCENARIOS = ("popup", "tags")
+
+
+def percentile(values, percent):
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def benchmark(runner, runs):
+    results = {}
+
+    start = time.perf_counter()
+    runner.start()
+    results["startup_s"] = round(time.perf_counter() - start, 3)
+    results["memory_idle_mb"] = browser_memory_mb()
+
+    try:
+        for scenario in SCENARIOS:
+            run = getattr(runner, scenario)
+            run()  # warm-up, not measured
+
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+
+            results[f"{scenario}_p50_ms"] = round(percentile(timings, 50) * 1000, 1)
+            results[f"{scenario}_p95_ms"] = round(percentile(timings, 95) * 1000, 1)
+
+        results["memory_peak_mb"] = browser_memory_mb()
+    finally:
+        runner.stop()
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for framework, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(framework, {}).get(metric)
+            if value is None or expected is None:
+                continue
+            if value > expected * (1 + tolerance):
+                regressions.append(f"{framework} {metric}: {value} (baseline {expected})")
+    return regressions
+
+
+def print_table(results):
+    metrics = list(next(iter(results.values())))
+    print(f"\n{'metric':<18}" + "".join(f"{framework:>14}" for framework in results))
+    for metric in metrics:
+        row = "".join(f"{str(results[framework].get(metric)):>14}" for framework in results)
+        print(f"{metric:<18}{row}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Compare Selenium and Playwright on the same scenarios")
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs per scenario (default: 20)")
+    parser.add_argument("--framework", choices=RUNNERS, action="append", help="Only run this framework")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slow-down against the baseline, 0.25 = 25%% (default)")
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Fail when there's no baseline to compare with")
+    args = parser.parse_args(argv)
+    if args.runs < 2:
+        parser.error("--runs has to be at least 2 to compute percentiles")
+
+    if args.check and not args.update_baseline and not BASELINE_FILE.exists():
+        print(f"No baseline at {BASELINE_FILE}, run with --update-baseline and commit it")
+        return 1
+
+    server = MirrorServer().start()
+    os.environ[SITE_URL_ENV] = server.url
+    try:
+        results = {}
+        for framework in args.framework or RUNNERS:
+            print(f"Benchmarking {framework} ({args.runs} runs per scenario)...")
+            results[framework] = benchmark(RUNNERS[framework](), args.runs)
+    finally:
+        server.stop()
+
+    print_table(results)
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print("\nNo baseline yet, run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
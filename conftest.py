@@ -0,0 +1,113 @@
+# Command line options shared by selenium_tests and playwright_tests
+# (pytest only picks up pytest_addoption from the root conftest)
+
+import os
+
+import pytest
+
+from helpers.har import HarProxy
+from helpers.mirror import MirrorServer
+from helpers.site import LIVE_SITE_URL, SITE_URL_ENV
+
+pytest_plugins = [
+    "helpers.parallel",
+    "helpers.http_check",
+    "helpers.timing",
+    "helpers.network",
+    "helpers.result_cache",
+    "helpers.browser_matrix",
+    "helpers.motion",
+    "helpers.adaptive_wait",
+]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption(
+        "--no-driver-pool",
+        action="store_true",
+        default=False,
+        help="Launch a fresh browser for every selenium test instead of reusing warm ones",
+    )
+    group.addoption(
+        "--no-browser-daemon",
+        action="store_true",
+        default=False,
+        help="Launch browsers locally even when the browser daemon (python -m helpers.browser_daemon) is running",
+    )
+    group.addoption(
+        "--site",
+        default=os.environ.get("QA_PLAYGROUND_SITE", "live"),
+        help="Site to test: 'live' (qaplayground.dev), 'mirror' (bundled local copy) or a base URL",
+    )
+    group.addoption(
+        "--concurrent-matrix",
+        action="store_true",
+        default=False,
+        help="Run Playwright parametrized matrices (rating stars) concurrently with the async API",
+    )
+    group.addoption(
+        "--matrix-concurrency",
+        type=int,
+        default=8,
+        help="How many pages --concurrent-matrix runs at the same time (default: 8)",
+    )
+    group.addoption(
+        "--warm-pages",
+        type=int,
+        default=2,
+        help="How many pages of the current app Playwright preloads for the next tests, 0 turns it off (default: 2)",
+    )
+    group.addoption(
+        "--record",
+        action="store_true",
+        default=False,
+        help="Save every response from the site into HAR archives, one per app (see --har-dir)",
+    )
+    group.addoption(
+        "--replay",
+        action="store_true",
+        default=False,
+        help="Serve the site from the HAR archives instead of the network",
+    )
+    group.addoption(
+        "--har-dir",
+        default="har",
+        help="Directory of the --record/--replay archives, relative to the rootdir (default: har)",
+    )
+
+
+def pytest_configure(config):
+    site = config.getoption("--site")
+    config.mirror_server = None
+
+    if site == "mirror":
+        config.mirror_server = MirrorServer().start()
+        os.environ[SITE_URL_ENV] = config.mirror_server.url
+    elif site == "live":
+        os.environ[SITE_URL_ENV] = LIVE_SITE_URL
+    else:
+        os.environ[SITE_URL_ENV] = site
+
+    # --record/--replay put a proxy in front of whatever site was picked above
+    config.har_proxy = None
+    record, replay = config.getoption("--record"), config.getoption("--replay")
+    if record and replay:
+        raise pytest.UsageError("--record and --replay can't be used together")
+    if record or replay:
+        har_dir = config.rootpath / config.getoption("--har-dir")
+        config.har_proxy = HarProxy("record" if record else "replay", os.environ[SITE_URL_ENV], har_dir).start()
+        config.pluginmanager.register(config.har_proxy, "har-proxy")
+        os.environ[SITE_URL_ENV] = config.har_proxy.url
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "har_proxy", None) is not None:
+        config.har_proxy.stop()
+    if getattr(config, "mirror_server", None) is not None:
+        config.mirror_server.stop()
+
+
+@pytest.fixture(scope="session")
+def mirror_server(pytestconfig):
+    return pytestconfig.mirror_server
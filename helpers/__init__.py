@@ -0,0 +1 @@
+# Shared helpers for selenium_tests and playwright_tests
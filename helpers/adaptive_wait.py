@@ -0,0 +1,173 @@
+# AdaptiveWait - WebDriverWait with a polling interval that adapts to the condition
+# WebDriverWait checks its condition every 0.5 s, so a condition that's true after 20 ms still costs 500 ms.
+# AdaptiveWait checks right away, then after 10 ms, each sleep half again as long as the last, up to the usual 0.5 s.
+# It also remembers how long each condition took in previous runs (pytest cache): when a condition usually
+# takes ~300 ms, the first sleep goes straight to just before that instead of polling all the way there.
+#
+#     wait = AdaptiveWait(driver, 10)    # same arguments as WebDriverWait, poll_frequency is ignored
+#     wait.until(EC.element_to_be_clickable((By.XPATH, SUBMIT_BUTTON_XPATH)))
+#
+# Conditions are named after the EC function and its locator (helpers.timing.describe_condition) plus the file and
+# line the function is defined on, and the history is kept per browser.
+# --wait-stats prints which waits took the most time in the run, per test module.
+
+import time
+from collections import defaultdict
+from pathlib import Path
+from statistics import median
+
+from helpers.timing import describe_condition
+
+try:
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.wait import WebDriverWait
+except ImportError:  # Playwright-only installs still load the plugin (for its option and summary)
+    WebDriverWait = object
+
+ROOT = Path(__file__).resolve().parent.parent
+DURATIONS_KEY = "qa_playground/wait_durations"
+MIN_INTERVAL = 0.01
+MAX_INTERVAL = 0.5
+MAX_LEARNED_SLEEP = 1.0  # a slow history shouldn't make one fast wait sleep for seconds
+BACKOFF = 1.5
+HISTORY_SIZE = 50
+SUMMARY_SIZE = 10
+
+
+def intervals(typical=None):
+    """Sleeps between checks: straight to 80 % of the typical duration if there is one, then fine-grained backoff."""
+    if typical:
+        yield min(max(MIN_INTERVAL, typical * 0.8), MAX_LEARNED_SLEEP)
+    interval = MIN_INTERVAL
+    while True:
+        yield interval
+        interval = min(interval * BACKOFF, MAX_INTERVAL)
+
+
+class WaitStats:
+    def __init__(self):
+        self.history = {}  # condition -> durations of its last successful waits, from earlier runs too
+        self.waits = []  # (test module, condition, seconds, checks, timed out) of this run
+        self.module = None
+
+    def typical(self, condition):
+        durations = self.history.get(condition)
+        return median(durations) if durations else None
+
+    def record(self, condition, duration, checks, timed_out):
+        self.waits.append((self.module, condition, duration, checks, timed_out))
+        if not timed_out:
+            durations = self.history.setdefault(condition, [])
+            durations.append(duration)
+            del durations[:-HISTORY_SIZE]
+
+
+STATS = WaitStats()
+
+
+def source_of(code):
+    # Relative to the repo, so the history keys are the same on every machine
+    path = Path(code.co_filename).resolve()
+    filename = path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else path.name
+    return f"{filename}:{code.co_firstlineno}"
+
+
+def condition_key(wait, method):
+    """The condition's name, where it's defined (file:line) and the browser it runs in."""
+    name = describe_condition(wait, method)
+    code = getattr(method, "__code__", None)
+    if code is not None:
+        # Every module-level lambda is called "<lambda>", two different ones mustn't share their history
+        name = f"{name} {source_of(code)}"
+    driver = getattr(wait._driver, "parent", wait._driver)  # waits can run on an element too
+    return f"{getattr(driver, 'name', '?')} {name}"
+
+
+class AdaptiveWait(WebDriverWait):
+    def until(self, method, message=""):
+        return self._wait(method, message, expected=True)
+
+    def until_not(self, method, message=""):
+        return self._wait(method, message, expected=False)
+
+    def _wait(self, method, message, expected):
+        condition = condition_key(self, method)
+        sleeps = intervals(STATS.typical(condition))
+        start = time.monotonic()
+        end = start + self._timeout
+        screen = stacktrace = None
+        checks = 0
+
+        while True:
+            checks += 1
+            try:
+                value = method(self._driver)
+                if bool(value) == expected:
+                    STATS.record(condition, time.monotonic() - start, checks, timed_out=False)
+                    return value  # like WebDriverWait, until_not returns the falsy value itself
+            except self._ignored_exceptions as error:
+                # Like WebDriverWait: an ignored exception means "not yet" for until and "done" for until_not
+                if not expected:
+                    STATS.record(condition, time.monotonic() - start, checks, timed_out=False)
+                    return True
+                screen = getattr(error, "screen", None)
+                stacktrace = getattr(error, "stacktrace", None)
+
+            now = time.monotonic()
+            if now > end:
+                break
+            time.sleep(min(next(sleeps), end - now))
+
+        STATS.record(condition, time.monotonic() - start, checks, timed_out=True)
+        raise TimeoutException(message, screen, stacktrace)
+
+
+# PLUGIN #
+
+class WaitStatsPlugin:
+    def __init__(self, config):
+        self.config = config
+        STATS.history = config.cache.get(DURATIONS_KEY, {})
+
+    def pytest_runtest_logstart(self, nodeid):
+        STATS.module = nodeid.split("::")[0]
+
+    def pytest_sessionfinish(self):
+        self.config.cache.set(DURATIONS_KEY, STATS.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.config.getoption("--wait-stats") or not STATS.waits:
+            return
+
+        totals = defaultdict(list)
+        for module, condition, duration, checks, timed_out in STATS.waits:
+            totals[module, condition].append((duration, checks, timed_out))
+
+        terminalreporter.section("slowest adaptive waits")
+        terminalreporter.write_line(
+            f"{'total s':>9}{'count':>7}{'median ms':>11}{'max ms':>9}{'checks':>8}  module / condition"
+        )
+        slowest = sorted(totals.items(), key=lambda item: sum(wait[0] for wait in item[1]), reverse=True)
+        for (module, condition), waits in slowest[:SUMMARY_SIZE]:
+            durations = [wait[0] for wait in waits]
+            timeouts = sum(wait[2] for wait in waits)
+            terminalreporter.write_line(
+                f"{sum(durations):>9.2f}{len(waits):>7}{median(durations) * 1000:>11.1f}{max(durations) * 1000:>9.1f}"
+                f"{sum(wait[1] for wait in waits) / len(waits):>8.1f}  {module} / {condition}"
+                + (f"  ({timeouts} timed out)" if timeouts else "")
+            )
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption(
+        "--wait-stats",
+        action="store_true",
+        default=False,
+        help="Print the AdaptiveWait conditions that took the most time, per test module",
+    )
+
+
+def pytest_configure(config):
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(WaitStatsPlugin(config), "wait-stats")
@@ -0,0 +1,92 @@
+# Runs many Playwright test cases concurrently in one browser with the async API
+# Every case gets its own browser context and page (so cookies, storage and console errors never leak between
+# cases), the page is already on `url`, and at most `concurrency` cases run at the same time.
+#
+# pytest-playwright drives its sync API from the main thread, so the asyncio loop runs in a worker thread.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers.motion import apply_playwright_async
+from helpers.network import FULL, route_playwright_async
+
+
+class AsyncPageMatrix:
+    def __init__(
+        self,
+        url,
+        browser_name="chromium",
+        launch_args=None,
+        context_args=None,
+        concurrency=8,
+        network_profile=FULL,
+        reduced_motion=False,
+        network_stats=None,
+        har_proxy=None,
+        cdp_endpoint=None,
+    ):
+        self.url = url
+        self.browser_name = browser_name
+        self.launch_args = launch_args or {}
+        self.context_args = context_args or {}
+        self.concurrency = concurrency
+        self.network_profile = network_profile
+        self.reduced_motion = reduced_motion
+        self.network_stats = network_stats
+        self.har_proxy = har_proxy
+        self.cdp_endpoint = cdp_endpoint  # chromium only: attach to the browser daemon instead of launching
+
+    def run(self, cases):
+        """Runs {case_id: async fn(page, console_errors)} and returns {case_id: exception or None}."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._run_all(cases)).result()
+
+    async def _run_all(self, cases):
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as playwright:
+            if self.cdp_endpoint:
+                browser = await playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+            else:
+                browser = await getattr(playwright, self.browser_name).launch(**self.launch_args)
+            semaphore = asyncio.Semaphore(self.concurrency)
+            try:
+                outcomes = await asyncio.gather(
+                    *(self._run_case(browser, semaphore, case) for case in cases.values())
+                )
+            finally:
+                await browser.close()
+
+        return dict(zip(cases, outcomes))
+
+    async def _run_case(self, browser, semaphore, case):
+        # Whatever goes wrong - the case, or closing its context afterwards - is reported by the test that owns
+        # the case, never by gather(), which would lose every other case's outcome
+        async with semaphore:
+            try:
+                context = await browser.new_context(**self.context_args)
+            except Exception as error:
+                return error
+
+            outcome = None
+            try:
+                if self.har_proxy is not None:
+                    await self.har_proxy.route_playwright_async(context)
+                await route_playwright_async(context, self.network_profile, self.network_stats)
+                if self.reduced_motion:
+                    await apply_playwright_async(context)
+                page = await context.new_page()
+                console_errors = []
+                page.on("console", lambda msg: console_errors.append(msg) if msg.type == "error" else None)
+                await page.goto(self.url)
+                await case(page, console_errors)
+            except Exception as error:
+                outcome = error
+
+            try:
+                await context.close()
+            except Exception as error:
+                if outcome is None:
+                    outcome = RuntimeError(f"Closing the case's browser context failed: {error}")
+                    outcome.__cause__ = error
+        return outcome
@@ -0,0 +1,106 @@
+# Several Playwright checks in one page.evaluate call
+# Build a group of expectations, evaluate them in one round-trip and assert on the structured results:
+#
+#     Expectations() \
+#         .pseudo_content(".text", "I just hate it") \
+#         .checked("#star-1") \
+#         .attribute("#star-1", "name", "rate") \
+#         .visible("label[for='star-1']") \
+#         .assert_all(page)
+
+from dataclasses import dataclass
+
+BATCH_JS = """
+(checks) => {
+    const check = (el, kind, name, pseudo) => {
+        switch (kind) {
+            case "pseudo_content": {
+                const content = getComputedStyle(el, pseudo).getPropertyValue("content");
+                return content.replace(/^"(.*)"$/, "$1");
+            }
+            case "checked":
+                return el.checked === true;
+            case "attribute":
+                return el.getAttribute(name);
+            case "visible": {
+                const rect = el.getBoundingClientRect();
+                return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== "hidden";
+            }
+            case "text":
+                return el.innerText;
+        }
+        throw new Error(`Unknown check: ${kind}`);
+    };
+
+    return checks.map(({ kind, selector, name, pseudo }) => {
+        const el = document.querySelector(selector);
+        return el ? { found: true, value: check(el, kind, name, pseudo) } : { found: false, value: null };
+    });
+}
+"""
+
+
+@dataclass
+class CheckResult:
+    description: str
+    expected: object
+    actual: object
+    found: bool = True
+
+    @property
+    def passed(self):
+        return self.found and self.actual == self.expected
+
+    @property
+    def message(self):
+        if not self.found:
+            return f"{self.description}: element not found"
+        return f'{self.description}: expected "{self.expected}", got "{self.actual}"'
+
+
+class Expectations:
+    def __init__(self):
+        self.checks = []
+        self.expectations = []
+
+    def _add(self, description, expected, kind, selector, name=None, pseudo=None):
+        self.checks.append({"kind": kind, "selector": selector, "name": name, "pseudo": pseudo})
+        self.expectations.append((description, expected))
+        return self
+
+    def pseudo_content(self, selector, expected, pseudo="::before"):
+        return self._add(f"{selector}{pseudo} content", expected, "pseudo_content", selector, pseudo=pseudo)
+
+    def checked(self, selector, expected=True):
+        return self._add(f"{selector} checked", expected, "checked", selector)
+
+    def attribute(self, selector, name, expected):
+        return self._add(f'{selector} attribute "{name}"', expected, "attribute", selector, name=name)
+
+    def visible(self, selector, expected=True):
+        return self._add(f"{selector} visible", expected, "visible", selector)
+
+    def text(self, selector, expected):
+        return self._add(f"{selector} text", expected, "text", selector)
+
+    def _results(self, actual_values):
+        return [
+            CheckResult(description, expected, actual["value"], actual["found"])
+            for (description, expected), actual in zip(self.expectations, actual_values)
+        ]
+
+    def evaluate(self, page):
+        return self._results(page.evaluate(BATCH_JS, self.checks))
+
+    async def evaluate_async(self, page):
+        return self._results(await page.evaluate(BATCH_JS, self.checks))
+
+    def assert_all(self, page):
+        self._assert(self.evaluate(page))
+
+    async def assert_all_async(self, page):
+        self._assert(await self.evaluate_async(page))
+
+    def _assert(self, results):
+        failures = [result.message for result in results if not result.passed]
+        assert not failures, "\n".join(failures)
@@ -0,0 +1,401 @@
+# Background daemon that keeps Chrome and Firefox running between pytest invocations
+# Browser startup is most of the time of a short edit-run loop. With the daemon running, the Selenium pool
+# attaches to its browsers (Chrome through debuggerAddress, Firefox through geckodriver --connect-existing)
+# and Playwright's chromium connects over CDP, instead of launching a new browser every run.
+# When the daemon isn't running (or a browser is unhealthy) the fixtures launch browsers locally as before.
+#
+#   python -m helpers.browser_daemon start [--idle-timeout 1800] [--browsers chrome,firefox] [--headed]
+#   python -m helpers.browser_daemon status
+#   python -m helpers.browser_daemon stop
+#
+# Every test still gets an isolated context: a new Playwright browser context, and for Selenium Chrome a new
+# CDP browser context (a new tab with cookies/storage cleared if Chrome refuses). Firefox over marionette only
+# has one session at a time, so it's cleaned like a pooled driver; a second run attaching at the same time
+# launches its own Firefox.
+# The daemon checks the browsers every few seconds, restarts crashed ones, and shuts down after
+# --idle-timeout seconds without a test run attaching.
+# The browsers are headless unless the daemon is started with --headed. Selenium tests attach either way, the
+# headed ones (pop-up, new tab, dropdown...) included: they need real windows and tabs, which headless browsers
+# have too, not a screen. Start the daemon with --headed to watch them. Playwright's --headed only attaches to
+# a headed daemon.
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.request import urlopen
+
+STATE_DIR = Path(os.environ.get("QA_PLAYGROUND_DAEMON_DIR", Path.home() / ".cache" / "qa_playground"))
+STATE_FILE = STATE_DIR / "browser_daemon.json"
+ACTIVITY_FILE = STATE_DIR / "browser_daemon.activity"
+
+HEALTH_INTERVAL = 5
+HEARTBEAT_INTERVAL = 60
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+STARTUP_TIMEOUT = 20
+
+BROWSER_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"),
+    "firefox": ("firefox",),
+}
+
+
+def find_binary(browser):
+    override = os.environ.get(f"QA_PLAYGROUND_{browser.upper()}")
+    if override:
+        return override
+    return next((path for path in map(shutil.which, BROWSER_BINARIES[browser]) if path), None)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def port_open(port, timeout=0.5):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def chrome_healthy(port, timeout=0.5):
+    try:
+        with urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+# DAEMON #
+
+class BrowserDaemon:
+    def __init__(self, browsers, idle_timeout=DEFAULT_IDLE_TIMEOUT, headless=True):
+        self.browsers = [browser for browser in browsers if find_binary(browser)]
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self.processes = {}
+        self.ports = {}
+        self.profiles = {}
+        self.stopping = False
+
+    def launch(self, browser):
+        binary = find_binary(browser)
+        if binary is None:
+            return False
+
+        port = free_port()
+        profile = Path(tempfile.mkdtemp(prefix=f"qa_playground_{browser}_"))
+        if browser == "chrome":
+            args = [
+                binary,
+                f"--remote-debugging-port={port}",
+                f"--user-data-dir={profile}",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--window-size=1920,1080",
+                "about:blank",
+            ]
+            if self.headless:
+                args.insert(1, "--headless=new")
+        else:
+            (profile / "user.js").write_text(f'user_pref("marionette.port", {port});\n')
+            args = [binary, "--marionette", "--no-remote", "--profile", str(profile)]
+            if self.headless:
+                args.insert(1, "--headless")
+
+        self.processes[browser] = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.ports[browser] = port
+        self.profiles[browser] = profile
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.healthy(browser):
+                return True
+            time.sleep(0.1)
+        self.kill(browser)
+        return False
+
+    def healthy(self, browser):
+        process = self.processes.get(browser)
+        if process is None or process.poll() is not None:
+            return False
+        if browser == "chrome":
+            return chrome_healthy(self.ports[browser])
+        return port_open(self.ports[browser])
+
+    def kill(self, browser):
+        process = self.processes.pop(browser, None)
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.ports.pop(browser, None)
+        profile = self.profiles.pop(browser, None)
+        if profile is not None:
+            shutil.rmtree(profile, ignore_errors=True)
+
+    def write_state(self):
+        state = {
+            "pid": os.getpid(),
+            "started": time.time(),
+            "idle_timeout": self.idle_timeout,
+            "headless": self.headless,
+            "browsers": {
+                browser: {"port": port, "pid": self.processes[browser].pid} for browser, port in self.ports.items()
+            },
+        }
+        STATE_FILE.write_text(json.dumps(state, indent=2))
+
+    def idle_for(self):
+        try:
+            return time.time() - ACTIVITY_FILE.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def run(self):
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        ACTIVITY_FILE.touch()
+        signal.signal(signal.SIGTERM, lambda *args: setattr(self, "stopping", True))
+        signal.signal(signal.SIGINT, lambda *args: setattr(self, "stopping", True))
+
+        try:
+            for browser in self.browsers:
+                self.launch(browser)
+            self.write_state()
+
+            while not self.stopping and self.idle_for() < self.idle_timeout:
+                time.sleep(HEALTH_INTERVAL)
+                # Crashed or hung browsers are replaced, the new port goes into the state file
+                restarted = False
+                for browser in self.browsers:
+                    if not self.healthy(browser):
+                        self.kill(browser)
+                        self.launch(browser)
+                        restarted = True
+                if restarted:
+                    self.write_state()
+        finally:
+            for browser in list(self.processes):
+                self.kill(browser)
+            STATE_FILE.unlink(missing_ok=True)
+
+
+# CLIENT #
+
+def read_state():
+    """The running daemon's state, or None if there's no (live) daemon."""
+    try:
+        state = json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    return state if process_alive(state["pid"]) else None
+
+
+def browser_port(browser):
+    state = read_state()
+    if state is None or browser not in state["browsers"]:
+        return None
+
+    port = state["browsers"][browser]["port"]
+    healthy = chrome_healthy(port) if browser == "chrome" else port_open(port)
+    if not healthy:
+        return None
+
+    keep_alive()
+    return port
+
+
+_heartbeat = None
+_heartbeat_lock = threading.Lock()
+
+
+def keep_alive():
+    """Resets the daemon's idle timer now and every minute while this process runs.
+
+    A pooled run attaches once and then reuses the driver for hours, so the attach alone isn't enough activity.
+    """
+    global _heartbeat
+    ACTIVITY_FILE.touch()
+
+    def beat():
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                ACTIVITY_FILE.touch()
+            except OSError:  # the daemon has been stopped and its folder removed
+                pass
+
+    with _heartbeat_lock:
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=beat, name="browser-daemon-heartbeat", daemon=True)
+            _heartbeat.start()
+
+
+def is_headed():
+    """Whether the running daemon's browsers have visible windows (started with --headed)."""
+    state = read_state()
+    return state is not None and not state.get("headless", True)
+
+
+def cdp_endpoint():
+    port = browser_port("chrome")
+    return f"http://127.0.0.1:{port}" if port else None
+
+
+def attach_selenium(browser, performance_log=False):
+    """A WebDriver attached to the daemon's `browser`, or None so the caller can launch one itself."""
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+
+    from helpers.driver_pool import build_options
+
+    port = browser_port(browser)
+    if port is None:
+        return None
+
+    # A BiDi session can't be opened on a browser that was started without the driver
+    options = build_options(browser, bidi=False, performance_log=performance_log)
+    try:
+        if browser == "chrome":
+            options.debugger_address = f"127.0.0.1:{port}"
+            return webdriver.Chrome(options=options)
+        service = FirefoxService(service_args=["--connect-existing", "--marionette-port", str(port)])
+        return webdriver.Firefox(options=options, service=service)
+    except WebDriverException:  # e.g. Firefox already has a session from another run
+        return None
+
+
+def open_isolated_window(driver):
+    """Switches `driver` to a new window in a fresh browser context. Returns (context id or None, window handle)."""
+    from selenium.common.exceptions import WebDriverException
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            context = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            target = driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context}
+            )["targetId"]
+            driver.switch_to.window(target)  # chromedriver's window handles are the CDP target ids
+            return context, target
+        except WebDriverException:
+            pass
+
+    driver.switch_to.new_window("tab")
+    return None, driver.current_window_handle
+
+
+def close_isolated_window(driver, context, home=None):
+    """Closes the test's window (and context), then points the session at `home` or any window that's left.
+
+    Returns False when the browser has no window left, the session can't be used for another test then.
+    """
+    if context is not None:
+        driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context})
+    else:
+        driver.close()
+
+    handles = driver.window_handles
+    if not handles:
+        return False
+    driver.switch_to.window(home if home in handles else handles[0])
+    return True
+
+
+# CLI #
+
+def start(browsers, idle_timeout, headless=True):
+    if read_state() is not None:
+        return status()
+
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    subprocess.Popen(
+        [sys.executable, "-m", "helpers.browser_daemon", "serve",
+         "--browsers", ",".join(browsers), "--idle-timeout", str(idle_timeout)] + ([] if headless else ["--headed"]),
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT * len(browsers)
+    while time.monotonic() < deadline:
+        if read_state() is not None:
+            return status()
+        time.sleep(0.2)
+    print("Browser daemon didn't start")
+    return 1
+
+
+def stop():
+    state = read_state()
+    if state is None:
+        print("Browser daemon isn't running")
+        return 0
+
+    os.kill(state["pid"], signal.SIGTERM)
+    while process_alive(state["pid"]):
+        time.sleep(0.1)
+    print("Browser daemon stopped")
+    return 0
+
+
+def status():
+    state = read_state()
+    if state is None:
+        print("Browser daemon isn't running")
+        return 1
+
+    mode = "headless" if state.get("headless", True) else "headed"
+    print(f"Browser daemon running (pid {state['pid']}, {mode}, idle timeout {state['idle_timeout']} s)")
+    if not state["browsers"]:
+        print("  no browsers found - set QA_PLAYGROUND_CHROME / QA_PLAYGROUND_FIREFOX to their binaries")
+    for browser, info in state["browsers"].items():
+        healthy = chrome_healthy(info["port"]) if browser == "chrome" else port_open(info["port"])
+        print(f"  {browser:8} port {info['port']:5}  pid {info['pid']:7}  {'healthy' if healthy else 'NOT RESPONDING'}")
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Keep browsers running between pytest runs")
+    parser.add_argument("command", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--browsers", default="chrome,firefox", help="Comma separated (default: chrome,firefox)")
+    parser.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f"Shut down after this many seconds without a test run (default: {DEFAULT_IDLE_TIMEOUT})")
+    parser.add_argument("--headed", action="store_true", help="Launch the browsers with visible windows")
+    args = parser.parse_args(argv)
+    browsers = [browser for browser in args.browsers.split(",") if browser in BROWSER_BINARIES]
+
+    if args.command == "start":
+        return start(browsers, args.idle_timeout, headless=not args.headed)
+    if args.command == "stop":
+        return stop()
+    if args.command == "status":
+        return status()
+    BrowserDaemon(browsers, args.idle_timeout, headless=not args.headed).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
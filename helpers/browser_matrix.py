@@ -0,0 +1,156 @@
+# Cross-browser matrix in one test invocation (--browser-matrix)
+# Modules marked with @pytest.mark.browser_matrix parametrize their `driver` fixture over browsers, which
+# normally runs test[chrome] and then test[firefox] one after the other. With --browser-matrix the first
+# variant of every test runs the other variants on threads while it runs itself, each thread with its own
+# driver from the fixture, so a test costs about as long as its slowest browser instead of the sum.
+#
+# Every variant keeps its own test id and report: when pytest gets to test[firefox] its outcome (pass, failure
+# with the Firefox traceback, setup error...) is already known and only reported, no second browser is started.
+# A variant whose leader didn't run (deselected with -k, served from the result cache...) just runs normally.
+# pytest-xdist workers ignore the option, the variants of a test may end up on different workers there.
+
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from _pytest.runner import CallInfo
+
+MATRIX_FIXTURE = "driver"
+
+
+class VariantOutcome:
+    def __init__(self):
+        self.errors = {}  # "setup"/"call"/"teardown" -> exception
+        self.durations = {"setup": 0.0, "call": 0.0, "teardown": 0.0}
+
+
+def matrix_key(item):
+    """Items that only differ by their browser get the same key, or None for items outside the matrix."""
+    callspec = getattr(item, "callspec", None)
+    if item.get_closest_marker("browser_matrix") is None or callspec is None or MATRIX_FIXTURE not in callspec.params:
+        return None
+    others = sorted((name, repr(value)) for name, value in callspec.params.items() if name != MATRIX_FIXTURE)
+    return item.parent.nodeid, item.originalname, tuple(others)
+
+
+def run_variant(fixture_func, fixture_kwargs, test_func, test_kwargs):
+    """Runs one browser variant like pytest would: fixture setup, the test, fixture teardown."""
+    outcome = VariantOutcome()
+
+    def timed(when, step):
+        start = time.perf_counter()
+        try:
+            return step()
+        except BaseException as error:  # pytest.skip/fail raise BaseException subclasses
+            outcome.errors[when] = error
+        finally:
+            outcome.durations[when] = time.perf_counter() - start
+
+    fixture = fixture_func(**fixture_kwargs)
+    driver = timed("setup", lambda: next(fixture))
+    if "setup" in outcome.errors:
+        return outcome
+
+    timed("call", lambda: test_func(**{**test_kwargs, MATRIX_FIXTURE: driver}))
+    # Advancing the generator runs the code after the fixture's yield (the driver goes back to the pool)
+    timed("teardown", lambda: next(fixture, None))
+    return outcome
+
+
+class BrowserMatrix:
+    def __init__(self, config):
+        self.config = config
+        self.followers = {}  # leader nodeid -> the other browser variants of the same test
+        self.outcomes = {}  # follower nodeid -> VariantOutcome
+
+    def pytest_collection_finish(self, session):
+        # After deselection, so a variant that was filtered out isn't run by its leader
+        groups = {}
+        for item in session.items:
+            key = matrix_key(item)
+            if key is not None:
+                groups.setdefault(key, []).append(item)
+        for leader, *followers in groups.values():
+            if followers:
+                self.followers[leader.nodeid] = followers
+
+    def variant_args(self, leader, follower):
+        # The follower gets the fixture function of its own driver fixture and the leader's other fixture values
+        fixturedef = follower._fixtureinfo.name2fixturedefs[MATRIX_FIXTURE][-1]
+        request = SimpleNamespace(
+            param=follower.callspec.params[MATRIX_FIXTURE],
+            node=follower,
+            module=follower.module,
+            config=follower.config,
+            fixturename=MATRIX_FIXTURE,
+        )
+        fixture_kwargs = {
+            name: request if name == "request" else leader._request.getfixturevalue(name)
+            for name in inspect.signature(fixturedef.func).parameters
+        }
+        test_kwargs = {name: leader.funcargs[name] for name in leader._fixtureinfo.argnames}
+        return fixturedef.func, fixture_kwargs, follower.obj, test_kwargs
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        followers = self.followers.get(pyfuncitem.nodeid)
+        if not followers:
+            return (yield)
+
+        executor = ThreadPoolExecutor(len(followers), thread_name_prefix="browser-matrix")
+        futures = {
+            follower.nodeid: executor.submit(run_variant, *self.variant_args(pyfuncitem, follower))
+            for follower in followers
+        }
+        try:
+            return (yield)
+        finally:
+            # The leader's report waits for the slowest browser, the followers' reports come from the threads
+            executor.shutdown(wait=True)
+            for nodeid, future in futures.items():
+                self.outcomes[nodeid] = future.result()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        outcome = self.outcomes.pop(item.nodeid, None)
+        if outcome is None:
+            return None
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for when in ("setup", "call", "teardown"):
+            if when == "call" and "setup" in outcome.errors:
+                continue
+
+            def replay(when=when):
+                if when == "teardown":
+                    item.session._setupstate.teardown_exact(nextitem)
+                if when in outcome.errors:
+                    raise outcome.errors[when]
+
+            call = CallInfo.from_call(replay, when=when)
+            report = item.ihook.pytest_runtest_makereport(item=item, call=call)
+            report.duration = outcome.durations[when]
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption(
+        "--browser-matrix",
+        action="store_true",
+        default=False,
+        help="Run the browser variants of @pytest.mark.browser_matrix tests at the same time, one thread per browser",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "browser_matrix: the `driver` fixture is parametrized over browsers, --browser-matrix runs them concurrently",
+    )
+    if config.getoption("--browser-matrix") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(BrowserMatrix(config), "browser-matrix")
@@ -0,0 +1,83 @@
+# Test cases as data - one table of steps, run by the sync Playwright tests and by the async concurrent matrix
+# The sync module and its --concurrent-matrix twin check the same things; writing every case twice by hand lets
+# them drift apart. A case is a list of steps, and run() / run_async() play it with either API:
+#
+#   Click(selector)     clicks the element (fails if it isn't clickable)
+#   Visible(selector)   waits until the element is visible
+#   Expectations(...)   batch checks in one round-trip (helpers/batch_assert.py)
+#   Static(check)       check(dom) on a DOM snapshot of the page as loaded (helpers/dom_snapshot.py)
+#   NoConsoleErrors()   no console errors so far
+#
+# A case made of Static steps only doesn't need a page of its own: the sync tests read the session's cached
+# `dom_snapshot`, the matrix captures the page it already has.
+
+from dataclasses import dataclass
+from typing import Callable
+
+import pytest
+
+from helpers.batch_assert import Expectations
+from helpers.dom_snapshot import CAPTURE_JS, DomSnapshot
+
+
+@dataclass(frozen=True)
+class Click:
+    selector: str
+
+
+@dataclass(frozen=True)
+class Visible:
+    selector: str
+
+
+@dataclass(frozen=True)
+class Static:
+    check: Callable
+
+
+@dataclass(frozen=True)
+class NoConsoleErrors:
+    pass
+
+
+def needs_page(steps):
+    return not all(isinstance(step, Static) for step in steps)
+
+
+def _assert_no_console_errors(console_errors):
+    assert not console_errors, f"JS errors: {[message.text for message in console_errors]}"
+
+
+def run(steps, page, snapshot, console_errors):
+    """Plays the steps with Playwright's sync API. snapshot() returns the DomSnapshot for Static steps."""
+    from playwright.sync_api import expect
+
+    for step in steps:
+        if isinstance(step, Click):
+            page.locator(step.selector).click()
+        elif isinstance(step, Visible):
+            expect(page.locator(step.selector)).to_be_visible()
+        elif isinstance(step, Expectations):
+            step.assert_all(page)
+        elif isinstance(step, Static):
+            step.check(snapshot())
+        else:
+            _assert_no_console_errors(console_errors)
+
+
+async def run_async(steps, page, console_errors):
+    """Plays the steps with Playwright's async API, e.g. as an AsyncPageMatrix case."""
+    from playwright.async_api import expect
+
+    for step in steps:
+        if isinstance(step, Click):
+            await page.locator(step.selector).click()
+        elif isinstance(step, Visible):
+            await expect(page.locator(step.selector)).to_be_visible()
+        elif isinstance(step, Expectations):
+            await step.assert_all_async(page)
+        elif isinstance(step, Static):
+            pytest.importorskip("lxml")
+            step.check(DomSnapshot(await page.evaluate(CAPTURE_JS)))
+        else:
+            _assert_no_console_errors(console_errors)
@@ -0,0 +1,124 @@
+# Virtual clock for pages under test, Selenium and Playwright alike
+#
+#     clock = install_clock(driver_or_page)
+#     button.click()
+#     clock.advance(500)   # run the timers due in the next 500 ms, move CSS animations 500 ms on
+#     clock.run_all()      # run every pending timer and finish every animation (raises if they never stop)
+#
+# install_clock() replaces setTimeout/setInterval/requestAnimationFrame (and their clear* twins), Date and
+# performance.now in the current document with versions that only move when the test says so. Timers then run
+# in order of their virtual due time, without the test sleeping through them. CSS animations and transitions
+# still run on the browser's own clock, so advance() and run_all() also seek them through the Web Animations API.
+#
+# The clock lives in the document: timers created before install_clock() stay real, and a navigation drops it
+# (the next advance()/run_all() installs it again). Playwright's page.clock would do the timers too, but it
+# can't run_all() or move CSS animations, so both drivers get the same script.
+
+CLOCK_JS = """
+(command, ms) => {
+    const FRAME = 16;
+    const LIMIT = 10000;
+
+    const clock = window.__qaClock || (window.__qaClock = (() => {
+        const RealDate = Date;
+        const realNow = performance.now.bind(performance);
+        const clock = { now: 0, startDate: RealDate.now(), startPerf: realNow(), timers: new Map(), nextId: 1 };
+
+        const schedule = (callback, delay, args, interval) => {
+            const id = clock.nextId++;
+            clock.timers.set(id, { callback, args, at: clock.now + Math.max(0, Number(delay) || 0), interval });
+            return id;
+        };
+        const cancel = (id) => { clock.timers.delete(id); };
+
+        window.setTimeout = (callback, delay, ...args) => schedule(callback, delay, args, 0);
+        window.setInterval = (callback, delay, ...args) => schedule(callback, delay, args, Math.max(1, Number(delay) || 0));
+        window.requestAnimationFrame = (callback) =>
+            schedule(() => callback(performance.now()), FRAME - (clock.now % FRAME), [], 0);
+        window.clearTimeout = window.clearInterval = window.cancelAnimationFrame = cancel;
+
+        function FakeDate(...args) {
+            if (!new.target) return new RealDate(clock.startDate + clock.now).toString();
+            return args.length ? new RealDate(...args) : new RealDate(clock.startDate + clock.now);
+        }
+        FakeDate.prototype = RealDate.prototype;
+        FakeDate.now = () => clock.startDate + clock.now;
+        FakeDate.parse = RealDate.parse;
+        FakeDate.UTC = RealDate.UTC;
+        window.Date = FakeDate;
+        Object.defineProperty(performance, "now", { value: () => clock.startPerf + clock.now, configurable: true });
+
+        // Runs the earliest timer due by `until`, false when there's none
+        clock.runNext = (until) => {
+            let next = null;
+            for (const entry of clock.timers) {
+                if (entry[1].at <= until && (!next || entry[1].at < next[1].at)) next = entry;
+            }
+            if (!next) return false;
+
+            const [id, timer] = next;
+            clock.now = Math.max(clock.now, timer.at);
+            if (timer.interval) timer.at += timer.interval;
+            else clock.timers.delete(id);
+            try {
+                if (typeof timer.callback === "function") timer.callback(...timer.args);
+                else (0, eval)(String(timer.callback));
+            } catch (error) {
+                // Like a real timer: the error goes to the console and the other timers still run
+                console.error(error);
+            }
+            return true;
+        };
+        return clock;
+    })());
+
+    let ran = 0;
+    if (command === "advance") {
+        const target = clock.now + ms;
+        while (ran < LIMIT && clock.runNext(target)) ran++;
+        clock.now = target;
+        document.getAnimations().forEach((animation) => {
+            if (animation.playState === "running") animation.currentTime = (animation.currentTime || 0) + ms;
+        });
+    } else if (command === "run_all") {
+        while (ran < LIMIT && clock.runNext(Infinity)) ran++;
+        document.getAnimations().forEach((animation) => {
+            try { animation.finish(); } catch (error) {}  // infinite animations can't finish
+        });
+    }
+    return { ran, pending: clock.timers.size, now: clock.now };
+}
+"""
+
+
+class VirtualClock:
+    def __init__(self, target):
+        self.target = target
+
+    def _send(self, command, ms=0):
+        if hasattr(self.target, "execute_script"):  # Selenium driver
+            return self.target.execute_script(f"return ({CLOCK_JS})(arguments[0], arguments[1]);", command, ms)
+        return self.target.evaluate(f"([command, ms]) => ({CLOCK_JS})(command, ms)", [command, ms])
+
+    @property
+    def now(self):
+        """Virtual milliseconds since the clock was installed."""
+        return self._send("now")["now"]
+
+    def advance(self, ms):
+        """Runs the timers due in the next `ms` virtual milliseconds. Returns how many callbacks ran."""
+        return self._send("advance", ms)["ran"]
+
+    def run_all(self):
+        """Runs timers until none are left. Returns how many callbacks ran."""
+        result = self._send("run_all")
+        if result["pending"]:
+            raise RuntimeError(f"Timers are still pending after {result['ran']} callbacks (an endless interval?)")
+        return result["ran"]
+
+
+def install_clock(target):
+    """Installs the virtual clock in the current document of a Selenium driver or a Playwright page."""
+    clock = VirtualClock(target)
+    clock._send("install")
+    return clock
@@ -0,0 +1,98 @@
+# Static DOM snapshots - the rendered page as an in-memory tree
+# A lot of checks are static facts about the page: an attribute, a label, how the iframes are nested, the
+# initial texts. capture() serializes the whole rendered DOM in one script call, and those checks then run as
+# XPath/CSS queries on an lxml tree in microseconds. The `dom_snapshot` fixtures capture each app once per run.
+#
+# What's in the tree besides the page's own elements and attributes:
+#   <shadow-root>     first child of every host with an open shadow root, holding the shadow tree
+#   <frame-document>  first child of every same-origin <iframe>/<frame>, holding the frame's <html>
+#   qa-displayed      "true"/"false" on every element, whether it takes up space and isn't hidden
+#   qa-text           the element's rendered text (innerText, e.g. with text-transform applied)
+#
+#     dom = dom_snapshot(BASE_URL)
+#     dom.xpath("//progress-bar/shadow-root/div")
+#     dom.xpath("//iframe[@src='iframe1.html']/frame-document//iframe[@src='iframe2.html']")
+#
+# lxml is optional, tests using the fixtures are skipped without it. css() also needs cssselect.
+
+CAPTURE_JS = r"""
+() => {
+    const NAME = /^[A-Za-z_][\w.-]*$/;
+    const escape = (value) => String(value)
+        .replace(/[\u0000-\u0008\u000B\u000C\u000E-\u001F]/g, "")
+        .replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+
+    const displayed = (el) => {
+        const rect = el.getBoundingClientRect();
+        const style = el.ownerDocument.defaultView.getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== "hidden" && style.display !== "none";
+    };
+
+    const children = (parent) => Array.from(parent.childNodes, serialize).join("");
+
+    // Well-formed XML: attributes that aren't valid XML names (and xmlns, so there are no namespaces) are left out
+    const serialize = (node) => {
+        if (node.nodeType === Node.TEXT_NODE) return escape(node.data);
+        if (node.nodeType !== Node.ELEMENT_NODE || !NAME.test(node.localName)) return "";
+
+        const tag = node.localName;
+        let out = `<${tag}`;
+        for (const attr of node.attributes) {
+            if (NAME.test(attr.name) && !attr.name.startsWith("xmlns") && !attr.name.startsWith("qa-")) {
+                out += ` ${attr.name}="${escape(attr.value)}"`;
+            }
+        }
+        out += ` qa-displayed="${displayed(node)}"`;
+        if (node.innerText !== undefined) out += ` qa-text="${escape(node.innerText.trim())}"`;
+        out += ">";
+
+        if (node.shadowRoot) out += `<shadow-root>${children(node.shadowRoot)}</shadow-root>`;
+        if (tag === "iframe" || tag === "frame") {
+            try {
+                const doc = node.contentDocument;
+                if (doc && doc.documentElement) out += `<frame-document>${serialize(doc.documentElement)}</frame-document>`;
+            } catch (error) {}  // cross-origin
+        }
+        return `${out}${children(node)}</${tag}>`;
+    };
+
+    return serialize(document.documentElement);
+}
+"""
+
+
+class DomSnapshot:
+    def __init__(self, xml):
+        from lxml import etree
+
+        self.xml = xml
+        self.root = etree.fromstring(xml.encode("utf-8"))
+
+    def xpath(self, expression):
+        return self.root.xpath(expression)
+
+    def css(self, selector):
+        from lxml.cssselect import CSSSelector
+
+        return CSSSelector(selector)(self.root)
+
+    def first(self, expression):
+        found = self.xpath(expression)
+        return found[0] if found else None
+
+
+def capture(target):
+    """Snapshot of the current page of a Selenium driver or a Playwright page."""
+    if hasattr(target, "execute_script"):  # Selenium driver
+        xml = target.execute_script(f"return ({CAPTURE_JS})();")
+    else:
+        xml = target.evaluate(CAPTURE_JS)
+    return DomSnapshot(xml)
+
+
+def displayed(element):
+    return element.get("qa-displayed") == "true"
+
+
+def text(element):
+    return element.get("qa-text")
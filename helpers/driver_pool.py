@@ -0,0 +1,184 @@
+# Pool of warm WebDriver instances shared by the whole session
+# Launching Chrome/Firefox is the slowest part of every selenium test, so instead of
+# quitting the browser after each test it's cleaned up and handed to the next one
+
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from helpers import motion
+from helpers.browser_daemon import attach_selenium, close_isolated_window, open_isolated_window
+from helpers.network import FULL, apply_selenium, collect_selenium
+
+SUPPORTED_BROWSERS = ("chrome", "firefox")
+
+
+def build_options(browser, headless=False, bidi=True, performance_log=False):
+    if browser == "chrome":
+        options = ChromeOptions()
+        if performance_log:
+            # Requests blocked by a network profile are only reported in the performance log
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    elif browser == "firefox":
+        options = FirefoxOptions()
+    else:
+        raise Exception(f"Unsupported browser: {browser}")
+
+    options.add_argument("--start-maximized")
+    if bidi:
+        # WebDriver BiDi, so helpers/windows.py gets window events instead of polling window_handles
+        options.set_capability("webSocketUrl", True)
+    if headless:
+        options.add_argument("--headless")
+    return options
+
+
+def launch_driver(browser, headless=False, performance_log=False):
+    options = build_options(browser, headless, performance_log=performance_log)
+
+    if browser == "chrome":
+        return webdriver.Chrome(options=options)
+    return webdriver.Firefox(options=options)
+
+
+def reset_driver(driver, main_window, keep=()):
+    # Close every window the test has opened (pop-ups, new tabs) and go back to the main one.
+    # `keep` are windows that were there before the test and aren't ours (the daemon's browser is shared).
+    for window in driver.window_handles:
+        if window != main_window and window not in keep:
+            driver.switch_to.window(window)
+            driver.close()
+    driver.switch_to.window(main_window)
+    driver.switch_to.default_content()
+
+    # Cookies and storage are per origin, so they're cleared while still on the test's page
+    driver.delete_all_cookies()
+    driver.execute_script("""
+        try { window.localStorage.clear(); } catch (e) {}
+        try { window.sessionStorage.clear(); } catch (e) {}
+    """)
+
+
+class DriverPool:
+    """Keeps idle browsers alive between tests, keyed by (browser, headless) - or (browser, "daemon") for the
+    drivers attached to the browser daemon, which serve headed and headless tests alike."""
+
+    def __init__(self, reuse=True, network_stats=None, use_daemon=True, har_proxy=None, performance_log=False):
+        self.reuse = reuse
+        self.network_stats = network_stats
+        # Only needed to count what network profiles block; Chrome logs every request into it otherwise
+        self.performance_log = performance_log and network_stats is not None
+        self.har_proxy = har_proxy
+        self.use_daemon = use_daemon
+        self.launches = 0
+        self._idle = {}
+        self._main_windows = {}
+        self._profiles = {}
+        self._attached = set()  # drivers attached to the browser daemon (see helpers/browser_daemon.py)
+        self._contexts = {}
+        self._foreign_windows = {}  # attached drivers: windows that existed before the test got its window
+        self._motion_scripts = {}
+        # --browser-matrix borrows drivers from several threads at once (see helpers/browser_matrix.py)
+        self._lock = threading.Lock()
+
+    def acquire(self, browser="chrome", headless=False, base_url=None, network_profile=None, reduced_motion=False):
+        key = (browser, headless)
+        with self._lock:
+            idle = self._idle.get((browser, "daemon")) or self._idle.setdefault(key, [])
+            driver = idle.pop() if self.reuse and idle else None
+
+        if driver is None:
+            driver = attach_selenium(browser, self.performance_log) if self.use_daemon else None
+            if driver is not None:
+                self._attached.add(driver)
+            else:
+                driver = launch_driver(browser, headless, self.performance_log)
+                with self._lock:
+                    self.launches += 1
+            self._main_windows[driver] = (key, driver.current_window_handle)
+
+        if driver in self._attached:
+            key = (browser, "daemon")
+            # The daemon's browser outlives this run, so every test gets its own browser context in it
+            self._foreign_windows[driver] = set(driver.window_handles)
+            context, window = open_isolated_window(driver)
+            self._contexts[driver] = context
+            self._main_windows[driver] = (key, window)
+
+        # FULL blocks nothing, and drivers always come back unfiltered - no CDP round-trips for it
+        if network_profile not in (None, FULL) and apply_selenium(driver, network_profile):
+            self._profiles[driver] = network_profile
+
+        if reduced_motion:
+            self._motion_scripts[driver] = motion.register_selenium(driver)
+
+        if base_url is not None:
+            driver.get(base_url)
+        if reduced_motion:
+            motion.apply_selenium(driver)
+        return driver
+
+    def release(self, driver):
+        key, main_window = self._main_windows[driver]
+        profile = self._profiles.pop(driver, None)
+        motion_script = self._motion_scripts.pop(driver, None)
+        foreign_windows = self._foreign_windows.pop(driver, set())
+
+        try:
+            # A test can end on a pop-up that has closed already - the CDP commands below need a live window
+            driver.switch_to.window(main_window)
+            if self.har_proxy is not None:
+                self.har_proxy.collect_selenium(driver)
+            if motion_script is not None:
+                motion.unregister_selenium(driver, motion_script)
+            if profile is not None:
+                # Count what the profile has blocked, then let the next test load everything again
+                if self.network_stats is not None and self.performance_log:
+                    collect_selenium(driver, profile, self.network_stats)
+                apply_selenium(driver, FULL)
+            if self.reuse or driver in self._attached:
+                reset_driver(driver, main_window, keep=foreign_windows)
+            if driver in self._attached:
+                home = next(iter(foreign_windows), None)
+                if not close_isolated_window(driver, self._contexts.pop(driver, None), home):
+                    self._discard(driver)
+                    return
+            if self.reuse:
+                with self._lock:
+                    self._idle.setdefault(key, []).append(driver)
+                return
+        except WebDriverException:
+            # The browser is broken (crashed, main window closed...) - don't hand it out again
+            pass
+
+        self._discard(driver)
+
+    @contextmanager
+    def driver(self, browser="chrome", headless=False, base_url=None, network_profile=None, reduced_motion=False):
+        driver = self.acquire(browser, headless, base_url, network_profile, reduced_motion)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        for drivers in self._idle.values():
+            for driver in drivers:
+                self._discard(driver)
+        self._idle.clear()
+
+    def _discard(self, driver):
+        # quit() on an attached driver only ends the session, the daemon's browser keeps running
+        self._main_windows.pop(driver, None)
+        self._attached.discard(driver)
+        self._contexts.pop(driver, None)
+        self._motion_scripts.pop(driver, None)
+        self._foreign_windows.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
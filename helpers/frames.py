@@ -0,0 +1,90 @@
+# Frame paths: the chain of iframes from the top document to a nested frame
+#
+#     IFRAMES = FramePath('iframe[src="iframe1.html"]', 'iframe[src="iframe2.html"]')
+#     IFRAMES.enter(driver)                 # Selenium: switch into iframe2 with as few commands as possible
+#     IFRAMES.query(driver_or_page, "a")    # one script call from any context, no switching at all
+#     IFRAMES.locator(page, "a")            # Playwright: frame_locator chain
+#
+# enter() first asks the page where the driver already is: if it's inside the path nothing is sent, if it's
+# inside a part of the path only the remaining hops are made, otherwise it starts from the top document.
+# query() walks contentDocument from the top, so it only works for same-origin frames (like the ones here).
+
+from selenium.common.exceptions import NoSuchFrameException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from helpers.adaptive_wait import AdaptiveWait
+
+# How many leading frames of the path the current context is already in, -1 if it's somewhere else
+CURRENT_DEPTH_JS = """
+const selectors = arguments[0];
+const chain = [];
+let win = window;
+while (win !== win.top) {
+    if (!win.frameElement) return -1;
+    chain.unshift(win.frameElement);
+    win = win.parent;
+}
+if (chain.length > selectors.length) return -1;
+return chain.every((frame, i) => frame.matches(selectors[i])) ? chain.length : -1;
+"""
+
+QUERY_JS = """
+(selectors, selector) => {
+    let doc = window.top.document;
+    for (const frameSelector of selectors) {
+        const frame = doc.querySelector(frameSelector);
+        if (!frame || !frame.contentDocument) return { missing: frameSelector };
+        doc = frame.contentDocument;
+    }
+    return { elements: Array.from(doc.querySelectorAll(selector)).map((el) => {
+        const rect = el.getBoundingClientRect();
+        const style = el.ownerDocument.defaultView.getComputedStyle(el);
+        return {
+            tag_name: el.tagName.toLowerCase(),
+            text: el.innerText,
+            attributes: Object.fromEntries(Array.from(el.attributes, (attr) => [attr.name, attr.value])),
+            displayed: rect.width > 0 && rect.height > 0 && style.visibility !== "hidden" && style.display !== "none",
+        };
+    }) };
+}
+"""
+
+
+class FramePath:
+    def __init__(self, *selectors):
+        self.selectors = list(selectors)
+
+    def __truediv__(self, selector):
+        return FramePath(*self.selectors, selector)
+
+    def enter(self, driver, timeout=10):
+        depth = driver.execute_script(CURRENT_DEPTH_JS, self.selectors)
+        if depth < 0:
+            driver.switch_to.default_content()
+            depth = 0
+
+        # frame_to_be_available_and_switch_to_it only polls while the frame isn't there yet
+        for selector in self.selectors[depth:]:
+            AdaptiveWait(driver, timeout).until(
+                EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, selector))
+            )
+
+    def query(self, target, selector):
+        """tag_name/text/attributes/displayed of every `selector` match inside the frame.
+
+        Raises NoSuchFrameException (for Playwright pages too) when a frame of the path isn't there.
+        """
+        if hasattr(target, "execute_script"):  # Selenium driver
+            result = target.execute_script(f"return ({QUERY_JS})(arguments[0], arguments[1]);", self.selectors, selector)
+        else:
+            result = target.evaluate(f"([selectors, selector]) => ({QUERY_JS})(selectors, selector)", [self.selectors, selector])
+        if "missing" in result:
+            raise NoSuchFrameException(f"No loaded frame {result['missing']!r} on the way to {self.selectors}")
+        return result["elements"]
+
+    def locator(self, page, selector):
+        frame = page
+        for frame_selector in self.selectors:
+            frame = frame.frame_locator(frame_selector)
+        return frame.locator(selector)
@@ -0,0 +1,316 @@
+# HAR record and replay
+# --record sends the whole suite through a local reverse proxy in front of the site and saves every response
+# into one HAR archive per app (har/<app>.har, everything outside /apps/ goes to _site.har).
+# --replay answers from those archives instead: selenium_tests and the HTTP status checks talk to the same kind
+# of proxy, playwright_tests fulfill their requests with route_from_har. Nothing goes to the network, so there's
+# no latency or variance left, and a request that isn't in the archives gets a 404 (proxy) or is aborted
+# (Playwright) and is listed at the end of the run.
+#
+# Only requests to the site pass through the proxy. Selenium still sends third-party requests (analytics,
+# web fonts...) straight out - a network profile blocks those. In --replay the driver pool reads what each page
+# loaded before the browser goes back to the pool, and third-party requests that went to the network are listed
+# at the end of the run next to the missing ones.
+
+import base64
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+# Not forwarded in either direction, bodies are stored decoded and Content-Length is recomputed
+SKIPPED_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "content-encoding",
+    "content-length",
+    "host",
+    "accept-encoding",
+}
+
+
+def app_of(path):
+    parts = urlsplit(path).path.strip("/").split("/")
+    if len(parts) >= 2 and parts[0] == "apps":
+        return parts[1]
+    return "_site"
+
+
+def path_of(url):
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def entry_key(entry):
+    return entry["request"]["method"], path_of(entry["request"]["url"])
+
+
+def read_har(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))["log"]["entries"]
+
+
+def write_har(path, entries):
+    har = {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "qa_playground_automation", "version": "1.0"},
+            "entries": list(entries),
+        }
+    }
+    Path(path).write_text(json.dumps(har, indent=1), encoding="utf-8")
+
+
+def make_entry(method, url, request_headers, status, reason, response_headers, body, elapsed):
+    headers = [{"name": name, "value": value} for name, value in response_headers]
+    content_type = next((h["value"] for h in headers if h["name"].lower() == "content-type"), "")
+    location = next((h["value"] for h in headers if h["name"].lower() == "location"), "")
+    return {
+        "startedDateTime": datetime.now(timezone.utc).isoformat(),
+        "time": elapsed * 1000,
+        "request": {
+            "method": method,
+            "url": url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": name, "value": value} for name, value in request_headers],
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": -1,
+        },
+        "response": {
+            "status": status,
+            "statusText": reason or "",
+            "httpVersion": "HTTP/1.1",
+            "headers": headers,
+            "cookies": [],
+            "content": {
+                "size": len(body),
+                "mimeType": content_type,
+                "text": base64.b64encode(body).decode("ascii"),
+                "encoding": "base64",
+            },
+            "redirectURL": location,
+            "headersSize": -1,
+            "bodySize": len(body),
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": elapsed * 1000, "receive": 0},
+    }
+
+
+class _NoRedirects(HTTPRedirectHandler):
+    # Redirects are recorded as they are, the browser follows them through the proxy
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HarProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args, proxy, **kwargs):
+        self.proxy = proxy
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self.proxy.respond(self)
+
+    do_HEAD = do_POST = do_PUT = do_DELETE = do_OPTIONS = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HarProxy:
+    """Reverse proxy that records responses from `upstream` (mode "record") or serves them from the archives ("replay")."""
+
+    def __init__(self, mode, upstream, har_dir, host="127.0.0.1", port=0):
+        self.mode = mode
+        self.upstream = upstream.rstrip("/")
+        self.har_dir = Path(har_dir)
+        self.entries = {}  # app -> {(method, path): entry}
+        self.missing = []
+        self.escaped = []  # Selenium third-party requests that went to the network during --replay
+        self.replay_har = None
+        self._lock = threading.Lock()
+        self._opener = build_opener(_NoRedirects)
+
+        self.httpd = ThreadingHTTPServer((host, port), partial(HarProxyHandler, proxy=self))
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+        if mode == "replay":
+            for path in sorted(self.har_dir.glob("*.har")):
+                self.entries[path.stem] = {entry_key(entry): entry for entry in read_har(path)}
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        if self.mode == "replay":
+            self.replay_har = self._write_replay_har()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.mode == "record":
+            self.save()
+        if self.replay_har is not None:
+            shutil.rmtree(self.replay_har.parent, ignore_errors=True)
+
+    def save(self):
+        self.har_dir.mkdir(parents=True, exist_ok=True)
+        for app, entries in self.entries.items():
+            path = self.har_dir / f"{app}.har"
+            archived = {entry_key(entry): entry for entry in read_har(path)} if path.exists() else {}
+            archived.update(entries)
+            write_har(path, archived.values())
+
+    def flag_missing(self, method, url):
+        with self._lock:
+            if (method, url) not in self.missing:
+                self.missing.append((method, url))
+
+    # SELENIUM #
+
+    def collect_selenium(self, driver):
+        """Flags the requests of the driver's current page that didn't go through the proxy (replay only)."""
+        if self.mode != "replay":
+            return
+        urls = driver.execute_script(
+            "return [location.href, ...performance.getEntriesByType('resource').map((e) => e.name)];"
+        )
+        proxy_host = urlsplit(self.url).netloc
+        with self._lock:
+            for url in urls:
+                parts = urlsplit(url)
+                if parts.scheme in ("http", "https") and parts.netloc != proxy_host and url not in self.escaped:
+                    self.escaped.append(url)
+
+    # PROXY #
+
+    def respond(self, handler):
+        key = (handler.command, handler.path)
+        if self.mode == "replay":
+            entry = self.entries.get(app_of(handler.path), {}).get(key)
+            if entry is None:
+                self.flag_missing(handler.command, self.upstream + handler.path)
+                handler.send_error(404, "Not in the HAR archives")
+                return
+        else:
+            try:
+                entry = self._record(handler)
+            except URLError as error:
+                handler.send_error(502, f"Upstream request failed: {error.reason}")
+                return
+            except socket.timeout:
+                handler.send_error(504, "Upstream request timed out")
+                return
+            with self._lock:
+                self.entries.setdefault(app_of(handler.path), {})[key] = entry
+
+        self._send(handler, entry["response"])
+
+    def _record(self, handler):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+        headers = {name: value for name, value in handler.headers.items() if name.lower() not in SKIPPED_HEADERS}
+        headers["Accept-Encoding"] = "identity"
+
+        url = self.upstream + handler.path
+        start = time.perf_counter()
+        try:
+            response = self._opener.open(Request(url, data=body, headers=headers, method=handler.command), timeout=30)
+        except HTTPError as error:  # 3xx/4xx/5xx are recorded like any other response
+            response = error
+        with response:
+            content = response.read()
+        elapsed = time.perf_counter() - start
+
+        response_headers = [(name, value) for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS]
+        return make_entry(handler.command, url, headers.items(), response.getcode(), response.reason, response_headers, content, elapsed)
+
+    def _send(self, handler, response):
+        body = base64.b64decode(response["content"].get("text", ""))
+        handler.send_response(response["status"], response["statusText"] or None)
+        for header in response["headers"]:
+            value = header["value"]
+            if header["name"].lower() == "location" and value.startswith(self.upstream):
+                value = self.url + path_of(value)
+            handler.send_header(header["name"], value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(body)
+
+    # PLAYWRIGHT #
+
+    def _write_replay_har(self):
+        # One archive with all apps, pointing at this proxy's URL - route_from_har matches full URLs
+        entries = []
+        for app_entries in self.entries.values():
+            for entry in app_entries.values():
+                entry = json.loads(json.dumps(entry))
+                entry["request"]["url"] = self.url + path_of(entry["request"]["url"])
+                entries.append(entry)
+
+        path = Path(tempfile.mkdtemp(prefix="qa_playground_har_")) / "replay.har"
+        write_har(path, entries)
+        return path
+
+    def route_playwright(self, context):
+        if self.mode != "replay":
+            return
+
+        def abort_missing(route):
+            self.flag_missing(route.request.method, route.request.url)
+            route.abort()
+
+        # Routes registered later run first: the archive answers, anything it doesn't have falls back to abort_missing
+        context.route("**/*", abort_missing)
+        context.route_from_har(self.replay_har, not_found="fallback")
+
+    async def route_playwright_async(self, context):
+        if self.mode != "replay":
+            return
+
+        async def abort_missing(route):
+            self.flag_missing(route.request.method, route.request.url)
+            await route.abort()
+
+        await context.route("**/*", abort_missing)
+        await context.route_from_har(self.replay_har, not_found="fallback")
+
+    # PLUGIN #
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.mode == "record":
+            terminalreporter.section("HAR record")
+            for app, entries in sorted(self.entries.items()):
+                terminalreporter.write_line(f"{len(entries):4} responses  {self.har_dir / f'{app}.har'}")
+            return
+        if self.missing:
+            terminalreporter.section("HAR replay: requests missing from the archives")
+            for method, url in self.missing:
+                terminalreporter.write_line(f"{method} {url}")
+        if self.escaped:
+            terminalreporter.section("HAR replay: third-party requests that went to the network (Selenium)")
+            for url in self.escaped:
+                terminalreporter.write_line(url)
@@ -0,0 +1,126 @@
+# Shared HTTP status checks for the "HTTPS response is 200" tests
+# Tests declare the URL they check with @pytest.mark.http_check(url). All those URLs are fetched once,
+# concurrently, through one keep-alive connection pool in the background as soon as collection is done (while
+# the first browser tests run), and every test just reads the memoized result from the `http_response` fixture.
+# xdist workers don't know which tests they'll get, so there the URLs are fetched when a test asks for them.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_WORKERS = 8
+TIMEOUT = 10  # seconds to connect and between bytes, a hanging host fails its own test only
+
+
+@dataclass
+class HttpResult:
+    url: str
+    status_code: int
+    ok: bool
+    ttfb: float
+    latency: float
+
+
+class HttpChecker:
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._results = {}
+        self._errors = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http-check")
+
+    def check(self, url):
+        with self._lock:
+            lock = self._locks.setdefault(url, threading.Lock())
+
+        # One fetch per URL per run, even when several threads ask for it at the same time.
+        # A failed fetch is kept too, and raised again in every test that checks that URL.
+        with lock:
+            if url not in self._results and url not in self._errors:
+                try:
+                    self._results[url] = self._fetch(url)
+                except requests.RequestException as error:
+                    self._errors[url] = error
+        if url in self._errors:
+            raise self._errors[url]
+        return self._results[url]
+
+    def prefetch(self, urls):
+        """Starts fetching `urls` in the background and returns right away."""
+        for url in set(urls):
+            self._executor.submit(self.check, url)  # errors stay with their URL, see check()
+
+    def results(self):
+        return list(self._results.values())
+
+    def errors(self):
+        return dict(self._errors)
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+        self.session.close()
+
+    def _fetch(self, url):
+        start = time.perf_counter()
+        # stream=True returns as soon as the headers arrive, reading the body afterwards gives the full latency
+        with self.session.get(url, stream=True, timeout=TIMEOUT) as response:
+            ttfb = time.perf_counter() - start
+            response.content
+            latency = time.perf_counter() - start
+        return HttpResult(url, response.status_code, response.ok, ttfb, latency)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "http_check(url): the test checks the HTTP response of `url`")
+    config.http_checker = None
+
+
+def pytest_collection_finish(session):
+    # After deselection, so only the URLs of tests that will run are fetched
+    urls = [marker.args[0] for item in session.items for marker in item.iter_markers("http_check")]
+    if urls and not hasattr(session.config, "workerinput"):
+        session.config.http_checker = HttpChecker()
+        session.config.http_checker.prefetch(urls)
+
+
+def pytest_unconfigure(config):
+    if config.http_checker is not None:
+        config.http_checker.close()
+
+
+@pytest.fixture(scope="session")
+def http_checker(pytestconfig):
+    if pytestconfig.http_checker is None:
+        pytestconfig.http_checker = HttpChecker()
+    return pytestconfig.http_checker
+
+
+@pytest.fixture
+def http_response(request, http_checker):
+    marker = request.node.get_closest_marker("http_check")
+    if marker is None:
+        raise Exception("http_response needs the test to be marked with @pytest.mark.http_check(url)")
+    return http_checker.check(marker.args[0])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.http_checker or not (config.http_checker.results() or config.http_checker.errors()):
+        return
+
+    terminalreporter.section("HTTP checks")
+    for result in sorted(config.http_checker.results(), key=lambda r: r.latency, reverse=True):
+        terminalreporter.write_line(
+            f"{result.status_code}  ttfb {result.ttfb * 1000:7.1f} ms  total {result.latency * 1000:7.1f} ms  {result.url}"
+        )
+    for url, error in config.http_checker.errors().items():
+        terminalreporter.write_line(f"ERR  {type(error).__name__}: {url}")
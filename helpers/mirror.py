@@ -0,0 +1,48 @@
+# Local HTTP server that serves the copies of the QA Playground apps stored in mirror/
+# Paths match the live site (/apps/popup/, /apps/popup/popup, /apps/iframe/iframe1.html...), and
+# extension-less paths like /apps/new-tab/new-page fall back to the .html file, same as on qaplayground.dev
+# The apps are hand-written approximations of the live ones, not saved copies - see mirror/README.md
+
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+MIRROR_ROOT = Path(__file__).resolve().parent.parent / "mirror"
+
+
+class MirrorRequestHandler(SimpleHTTPRequestHandler):
+    def translate_path(self, path):
+        translated = Path(super().translate_path(path))
+        if not translated.exists() and translated.with_suffix(".html").is_file():
+            return str(translated.with_suffix(".html"))
+        return str(translated)
+
+    def end_headers(self):
+        # The mirror files never change during a run, let the browser cache them
+        self.send_header("Cache-Control", "max-age=3600")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MirrorServer:
+    def __init__(self, host="127.0.0.1", port=0, root=MIRROR_ROOT):
+        handler = partial(MirrorRequestHandler, directory=str(root))
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
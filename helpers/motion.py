@@ -0,0 +1,185 @@
+# Reduced-motion mode (--reduced-motion)
+# The dropdown, popup and tags apps animate with CSS transitions, and every visibility/clickability wait sits
+# through them. With --reduced-motion every document gets a stylesheet that makes transitions and animations
+# (almost) instant: the top document, every open shadow root (attachShadow is patched for the ones created
+# later) and every same-origin iframe, again after each iframe navigation.
+#
+# Playwright adds the script to the context, so it runs in every frame and popup before the page's own scripts.
+# Selenium runs it after the pool opens the app, and Chrome also registers it for the next documents of the tab
+# (CDP Page.addScriptToEvaluateOnNewDocument), which is removed again when the driver goes back to the pool.
+# Limitation: Selenium pop-ups and new tabs are separate CDP targets, the script doesn't reach them and the popup
+# app's window still animates. A test that needs it there calls apply_selenium(driver) after switching windows.
+#
+# A test that needs the real animations opts out with @pytest.mark.real_motion.
+# Every run keeps how long each test took with and without the mode, and --reduced-motion runs print the
+# difference per module.
+
+import json
+
+DURATIONS_KEY = "qa_playground/motion_durations"
+
+# 0.01 ms instead of 0, so animationend/transitionend still fire for apps waiting on them
+REDUCED_MOTION_CSS = """
+*, *::before, *::after {
+    transition-duration: 0.01ms !important;
+    transition-delay: 0s !important;
+    animation-duration: 0.01ms !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+REDUCED_MOTION_JS = """
+(css) => {
+    const install = (win) => {
+        if (win.__qaReducedMotion) return;
+        win.__qaReducedMotion = true;
+
+        // A constructed sheet can be adopted before the document has any elements, and by shadow roots
+        const sheet = new win.CSSStyleSheet();
+        sheet.replaceSync(css);
+        const adopt = (root) => {
+            if (!root.adoptedStyleSheets.includes(sheet)) root.adoptedStyleSheets = [...root.adoptedStyleSheets, sheet];
+        };
+
+        const attachShadow = win.Element.prototype.attachShadow;
+        win.Element.prototype.attachShadow = function (...args) {
+            const root = attachShadow.apply(this, args);
+            adopt(root);
+            return root;
+        };
+
+        const watchFrame = (frame) => {
+            if (frame.__qaReducedMotion) return;
+            frame.__qaReducedMotion = true;
+            frame.addEventListener("load", () => visitFrame(frame));
+            visitFrame(frame);
+        };
+        const visitFrame = (frame) => {
+            try {
+                if (frame.contentWindow && frame.contentDocument) install(frame.contentWindow);
+            } catch (error) {}  // cross-origin
+        };
+        const visit = (root) => {
+            root.querySelectorAll("*").forEach((el) => {
+                if (el.shadowRoot) {
+                    adopt(el.shadowRoot);
+                    visit(el.shadowRoot);
+                }
+                if (el.tagName === "IFRAME" || el.tagName === "FRAME") watchFrame(el);
+            });
+        };
+
+        const doc = win.document;
+        adopt(doc);
+        visit(doc);
+        new win.MutationObserver((records) => records.forEach((record) => record.addedNodes.forEach((node) => {
+            if (node.nodeType !== 1) return;
+            if (node.tagName === "IFRAME" || node.tagName === "FRAME") watchFrame(node);
+            visit(node);
+        }))).observe(doc, { childList: true, subtree: true });
+    };
+    install(window);
+}
+"""
+
+
+def script():
+    return f"({REDUCED_MOTION_JS})({json.dumps(REDUCED_MOTION_CSS)});"
+
+
+def reduced_motion_for(request):
+    """Whether the requesting test runs with reduced motion: --reduced-motion and no real_motion marker."""
+    if not request.config.getoption("--reduced-motion"):
+        return False
+    return request.node.get_closest_marker("real_motion") is None
+
+
+# PLAYWRIGHT #
+
+def apply_playwright(context):
+    context.add_init_script(script=script())
+
+
+async def apply_playwright_async(context):
+    await context.add_init_script(script=script())
+
+
+# SELENIUM #
+
+def register_selenium(driver):
+    """Runs the script in every new document of the tab (Chrome). Returns the CDP identifier, or None."""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script()})["identifier"]
+
+
+def unregister_selenium(driver, identifier):
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+def apply_selenium(driver):
+    driver.execute_script(script())
+
+
+# PLUGIN #
+
+class MotionTimings:
+    def __init__(self, config):
+        self.config = config
+        self.mode = "reduced" if config.getoption("--reduced-motion") else "normal"
+        self.history = config.cache.get(DURATIONS_KEY, {"normal": {}, "reduced": {}})
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        # Results served by the result cache took no time, they'd make either mode look free
+        if getattr(report, "cached", False):
+            return
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self):
+        self.history[self.mode].update(self.durations)
+        self.config.cache.set(DURATIONS_KEY, self.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.mode != "reduced" or not self.durations:
+            return
+
+        # Only tests that have a time without the mode as well, so -k runs compare like with like
+        normal = self.history["normal"]
+        modules = {}
+        for nodeid, duration in self.durations.items():
+            if nodeid in normal:
+                totals = modules.setdefault(nodeid.split("::")[0], [0.0, 0.0, 0])
+                totals[0] += normal[nodeid]
+                totals[1] += duration
+                totals[2] += 1
+
+        terminalreporter.section("Reduced motion")
+        if not modules:
+            terminalreporter.write_line("No run without --reduced-motion to compare with yet")
+        for module, (before, after, count) in sorted(modules.items()):
+            change = (after - before) / before * 100 if before else 0.0
+            terminalreporter.write_line(
+                f"{module:50} {before:8.2f} s -> {after:8.2f} s  ({change:+6.1f} %, {count} tests)"
+            )
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption(
+        "--reduced-motion",
+        action="store_true",
+        default=False,
+        help="Make CSS transitions and animations instant in every page, shadow root and iframe",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "real_motion: the test needs the app's real animations, --reduced-motion doesn't apply to it",
+    )
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(MotionTimings(config), "motion-timings")
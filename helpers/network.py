@@ -0,0 +1,211 @@
+# Network profiles - what the browser is allowed to download while a test runs
+# Most tests only look at the DOM, so fonts, images and third-party scripts (analytics, ads, web fonts)
+# are just time spent waiting. A module opts in with `NETWORK_PROFILE = "minimal"`, a single test with
+# @pytest.mark.network_profile("assets-needed"). Without either everything is loaded, as before.
+#
+#   minimal        first-party documents, scripts and stylesheets only
+#   assets-needed  minimal + first-party images (e.g. the rating emojis)
+#   full           everything
+#
+# Playwright enforces it with context.route, Selenium with Chrome's CDP Network.setBlockedURLs
+# (Firefox has no CDP, so Firefox runs are never filtered). CDP only knows URL patterns, so there the
+# resource types are matched by file extension and third parties by a list of known hosts.
+
+import json
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from helpers.site import site_url
+
+SIZES_KEY = "qa_playground/resource_sizes"
+
+EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "svg", "webp", "avif", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav"),
+}
+
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+)
+
+
+def is_third_party(url):
+    host = urlsplit(url).hostname
+    return host is not None and host != urlsplit(site_url()).hostname
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    blocked_types: frozenset = frozenset()
+    block_third_party: bool = False
+
+    def blocks(self, resource_type, url):
+        if resource_type in self.blocked_types:
+            return True
+        return self.block_third_party and is_third_party(url)
+
+    def url_patterns(self):
+        patterns = [f"*.{extension}*" for kind in sorted(self.blocked_types) for extension in EXTENSIONS[kind]]
+        if self.block_third_party:
+            patterns.extend(THIRD_PARTY_PATTERNS)
+        return patterns
+
+
+PROFILES = {
+    "minimal": NetworkProfile("minimal", frozenset({"image", "font", "media"}), block_third_party=True),
+    "assets-needed": NetworkProfile("assets-needed", frozenset({"font", "media"}), block_third_party=True),
+    "full": NetworkProfile("full"),
+}
+FULL = PROFILES["full"]
+
+
+def get_profile(name):
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile: {name} (expected one of {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def profile_for(request):
+    """The profile of the requesting test: its network_profile marker, else the module's NETWORK_PROFILE."""
+    marker = request.node.get_closest_marker("network_profile")
+    if marker is not None:
+        return get_profile(marker.args[0])
+    return get_profile(getattr(request.module, "NETWORK_PROFILE", FULL.name))
+
+
+def filters_anything(items):
+    """Whether any of the collected items runs with a profile that blocks something."""
+    for item in items:
+        marker = item.get_closest_marker("network_profile")
+        name = marker.args[0] if marker is not None else getattr(item.module, "NETWORK_PROFILE", FULL.name)
+        if get_profile(name) is not FULL:
+            return True
+    return False
+
+
+def content_length(headers):
+    try:
+        return int(headers.get("content-length", 0))
+    except ValueError:
+        return 0
+
+
+class NetworkStats:
+    """Counts blocked requests per profile. Bytes saved are estimated from sizes seen in earlier runs."""
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.sizes = cache.get(SIZES_KEY, {}) if cache is not None else {}
+        self.blocked = {}
+
+    def record_size(self, url, size):
+        if size:
+            self.sizes[url] = size
+
+    def record_blocked(self, profile, url):
+        self.blocked.setdefault(profile.name, []).append(url)
+
+    def pytest_sessionfinish(self):
+        if self.cache is not None:
+            self.cache.set(SIZES_KEY, self.sizes)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.blocked:
+            return
+
+        terminalreporter.section("Network profiles")
+        for name, urls in sorted(self.blocked.items()):
+            known = [self.sizes[url] for url in urls if url in self.sizes]
+            terminalreporter.write_line(
+                f"{name:14} {len(urls):5} requests blocked  ~{sum(known) / 1024:8.1f} KB saved"
+                f"  (size known for {len(known)} of them)"
+            )
+
+
+# PLAYWRIGHT #
+
+def route_playwright(context, profile, stats=None):
+    if stats is not None:
+        context.on("response", lambda response: stats.record_size(response.url, content_length(response.headers)))
+    if profile is FULL:
+        return
+
+    def handle(route):
+        if profile.blocks(route.request.resource_type, route.request.url):
+            if stats is not None:
+                stats.record_blocked(profile, route.request.url)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    context.route("**/*", handle)
+
+
+async def route_playwright_async(context, profile, stats=None):
+    if stats is not None:
+        context.on("response", lambda response: stats.record_size(response.url, content_length(response.headers)))
+    if profile is FULL:
+        return
+
+    async def handle(route):
+        if profile.blocks(route.request.resource_type, route.request.url):
+            if stats is not None:
+                stats.record_blocked(profile, route.request.url)
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle)
+
+
+# SELENIUM #
+
+def apply_selenium(driver, profile):
+    """Blocks the profile's URLs for everything the driver loads next. Returns False if the browser can't."""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.url_patterns()})
+    return True
+
+
+def collect_selenium(driver, profile, stats):
+    # Sizes of what the current page did load
+    entries = driver.execute_script(
+        "return performance.getEntriesByType('resource').map(e => [e.name, e.encodedBodySize]);"
+    )
+    for url, size in entries:
+        stats.record_size(url, size)
+
+    # Blocked requests only show up in Chrome's performance log (see build_options' performance_log)
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return
+    urls = {}
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            stats.record_blocked(profile, urls.get(params["requestId"], "?"))
+
+
+# PLUGIN #
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "network_profile(name): what the browser may download for this test - minimal, assets-needed or full",
+    )
+    config.network_stats = NetworkStats(getattr(config, "cache", None))
+    config.pluginmanager.register(config.network_stats, "network-stats")
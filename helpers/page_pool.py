@@ -0,0 +1,60 @@
+# Pool of pre-navigated Playwright pages for one app
+# While a test runs, the next `size` pages are already loading in their own fresh browser contexts.
+# Each page is handed out exactly once and its context is closed after the test, so a test never gets
+# a page another test has touched.
+
+from collections import deque
+from weakref import WeakKeyDictionary
+
+from helpers.network import FULL
+
+# page -> URL it was preloaded with, until the test's navigation fixture consumes it
+_warm_urls = WeakKeyDictionary()
+
+
+class WarmPagePool:
+    def __init__(
+        self, browser, url, size=2, context_args=None, network_profile=FULL, reduced_motion=False, setup_context=None
+    ):
+        self.browser = browser
+        self.url = url
+        self.size = size
+        self.context_args = context_args or {}
+        self.network_profile = network_profile
+        self.reduced_motion = reduced_motion
+        # fn(context, network_profile, reduced_motion), installs routes and scripts before anything loads
+        self.setup_context = setup_context
+        self._ready = deque()
+
+    def _preload(self):
+        context = self.browser.new_context(**self.context_args)
+        if self.setup_context is not None:
+            self.setup_context(context, self.network_profile, self.reduced_motion)
+        page = context.new_page()
+        # Returns as soon as the response starts, the rest of the page loads while the current test runs
+        page.goto(self.url, wait_until="commit")
+        self._ready.append(page)
+
+    def fill(self):
+        while len(self._ready) < self.size:
+            self._preload()
+
+    def acquire(self):
+        if not self._ready:
+            self._preload()
+        page = self._ready.popleft()
+        _warm_urls[page] = self.url
+        self.fill()
+        return page
+
+    def close(self):
+        while self._ready:
+            self._ready.popleft().context.close()
+
+
+def open_app(page, url):
+    """Navigates to `url`, or just waits for the load to finish if the page was preloaded with it."""
+    if _warm_urls.pop(page, None) == url:
+        page.wait_for_load_state()
+    else:
+        page.goto(url)
@@ -0,0 +1,114 @@
+# Duration-aware sharding for parallel runs (pytest -n <workers>, needs pytest-xdist)
+# Every run stores how long each test took in the pytest cache. When the suite runs on several workers,
+# the tests are split up front so every worker gets about the same amount of work (longest tests first),
+# instead of slow ones like the shadow-dom progress test piling up on the same worker.
+# Each worker is its own pytest process, so it has its own driver pool and browsers.
+
+import heapq
+import os
+import shlex
+from statistics import median
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional - without it the suite simply runs serially
+    LoadScheduling = object
+
+DURATIONS_KEY = "qa_playground/durations"
+
+
+def balance(nodeids, durations, shards_count):
+    """Splits test indexes into shards with similar total duration (longest processing time first)."""
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default = median(known) if known else 1.0
+
+    def duration_of(index):
+        return durations.get(nodeids[index], default)
+
+    shards = [[] for _ in range(shards_count)]
+    loads = [(0.0, shard) for shard in range(shards_count)]
+    for index in sorted(range(len(nodeids)), key=duration_of, reverse=True):
+        load, shard = heapq.heappop(loads)
+        shards[shard].append(index)
+        heapq.heappush(loads, (load + duration_of(index), shard))
+
+    # Keep the collection order inside a shard so module fixtures are set up as few times as possible
+    return [sorted(shard) for shard in shards]
+
+
+class DurationScheduling(LoadScheduling):
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        cache = getattr(config, "cache", None)
+        self.durations = cache.get(DURATIONS_KEY, {}) if cache is not None else {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Tests have already been handed out (a worker crashed and its tests are being re-sent)
+        if self.collection is not None:
+            return super().schedule()
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(next(iter(self.node2collection.values())))
+        self.pending[:] = []
+        if not self.collection:
+            return
+        if self.maxschedchunk is None:
+            self.maxschedchunk = len(self.collection)
+
+        for node, shard in zip(self.nodes, balance(self.collection, self.durations, len(self.nodes))):
+            if shard:
+                self.node2pending[node].extend(shard)
+                node.send_runtest_some(shard)
+
+        # Everything is sent, workers stop once their shard is done
+        for node in self.nodes:
+            node.shutdown()
+
+
+def dist_given(config):
+    """Whether --dist (or -d) was passed, on the command line, in PYTEST_ADDOPTS or in the ini's addopts."""
+    args = [
+        *config.getini("addopts"),
+        *shlex.split(os.environ.get("PYTEST_ADDOPTS", "")),
+        *map(str, config.invocation_params.args),
+    ]
+    return any(arg in ("-d", "--dist") or arg.startswith("--dist=") for arg in args)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    # Only replace the default `-n` distribution, an explicit --dist (worksteal, loadscope, even load) wins
+    if config.getoption("dist") == "load" and not dist_given(config):
+        return DurationScheduling(config, log)
+    return None
+
+
+class DurationRecorder:
+    def __init__(self, cache):
+        self.cache = cache
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        # A result from the result cache took no time, the test's real duration stays what it was
+        if getattr(report, "cached", False):
+            return
+        # setup + call + teardown, fixture time is part of what a worker spends on the test
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self):
+        history = self.cache.get(DURATIONS_KEY, {})
+        history.update(self.durations)
+        self.cache.set(DURATIONS_KEY, history)
+
+
+def pytest_configure(config):
+    # Workers send their reports to the controller, so only the controller (or a serial run) records them
+    if getattr(config, "cache", None) is not None and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRecorder(config.cache), "duration-recorder")
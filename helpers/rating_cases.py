@@ -0,0 +1,126 @@
+# The rating app's test cases (https://qaplayground.dev/apps/rating/), shared by playwright_tests/test_rating.py
+# and its --concurrent-matrix twin test_rating_concurrent.py - see helpers/cases.py for the steps
+# Per-star cases get one entry for every star: CASES["feedback_text_matches-3"].
+
+from helpers.batch_assert import Expectations
+from helpers.cases import Click, NoConsoleErrors, Static, Visible
+from helpers.dom_snapshot import displayed
+
+STARS = range(1, 6)
+
+EXPECTED_TEXTS = [
+    "I just hate it",
+    "I don't like it",
+    "This is awesome",
+    "I just like it",
+    "I just love it",
+]
+
+CASES = {}
+CACHEABLE = set()  # only depend on the app's content, see helpers/result_cache.py
+
+
+def case(per_star=True, cacheable=False):
+    # Registers the steps the function returns under its name
+    def register(func):
+        if per_star:
+            cases = {f"{func.__name__}-{star}": func(star) for star in STARS}
+        else:
+            cases = {func.__name__: func()}
+        CASES.update(cases)
+        if cacheable:
+            CACHEABLE.update(cases)
+        return func
+    return register
+
+
+# HELPER FUNCTIONS #
+
+def label(star):
+    return f"label[for='star-{star}']"
+
+
+def has_visible_label(star):
+    def check(dom):
+        found = dom.first(f"//label[@for='star-{star}']")
+        assert found is not None and displayed(found), f"No visible label for star {star}"
+    return check
+
+
+def has_name(star, expected):
+    def check(dom):
+        assert dom.first(f"//input[@id='star-{star}']").get("name") == expected
+    return check
+
+
+# CASES #
+
+# 1. Button of a star is clickable
+@case()
+def star_button_is_clickable(star):
+    return [Click(label(star))]
+
+# 2. Correct emoji (<img src>) is shown
+@case()
+def correct_emoji_is_shown(star):
+    return [Click(label(star)), Visible(f".emojis li:nth-of-type({star})")]
+
+# 3. First span matches the expected one
+@case()
+def feedback_text_matches(star):
+    return [Click(label(star)), Expectations().pseudo_content(".text", EXPECTED_TEXTS[star - 1])]
+
+# 4. Second span matches the expected one
+@case()
+def count_text_matches(star):
+    return [Click(label(star)), Expectations().pseudo_content(".numb", f"{star} out of 5")]
+
+# 5. Clicked button has attribute "checked"
+@case()
+def clicked_button_is_checked(star):
+    return [Click(label(star)), Expectations().checked(f"#star-{star}")]
+
+# 6. There's a label for an input
+@case(cacheable=True)
+def each_input_has_label(star):
+    return [Static(has_visible_label(star))]
+
+# 7. An input (button) has an attribute "name"
+@case(cacheable=True)
+def input_has_name_attribute(star):
+    return [Static(has_name(star, "rate"))]
+
+# 8a. No JS errors are shown on load
+@case(per_star=False)
+def no_js_errors_on_load():
+    return [NoConsoleErrors()]
+
+# 8b. No JS errors after click
+@case()
+def no_js_errors_after_click(star):
+    return [Click(label(star)), NoConsoleErrors()]
+
+# 9. On page load, no stars are selected
+@case(per_star=False, cacheable=True)
+def no_stars_selected_on_load():
+    # All five radio buttons are checked in one round-trip
+    expectations = Expectations()
+    for i in STARS:
+        expectations.checked(f"#star-{i}", expected=False)
+    return [expectations]
+
+# 10. User cannot unselect once clicked
+@case()
+def cannot_unselect_star(star):
+    checked = Expectations().checked(f"#star-{star}")
+    return [Click(label(star)), checked, Click(label(star)), checked]
+
+# 11. Initial feedback text matches
+@case(per_star=False, cacheable=True)
+def feedback_text_matches_on_load():
+    return [Expectations().pseudo_content(".text", "Rate your experience")]
+
+# 12. Initial count text matches
+@case(per_star=False, cacheable=True)
+def count_text_matches_on_load():
+    return [Expectations().pseudo_content(".numb", "0 out of 5")]
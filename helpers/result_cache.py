@@ -0,0 +1,215 @@
+# Result cache for tests that only depend on what the app serves
+# A test marked with @pytest.mark.cacheable is keyed by the hash of its module's source, its parameters and
+# the app's content (the page plus every same-origin script, stylesheet, frame and asset it references).
+# The key also covers the helpers/ and conftest.py sources and the run options that change what a test sees
+# (--reduced-motion, --replay, the test's network profile).
+# When a test has passed with the same key before, it's reported as a cached pass and no browser is started.
+# Entries live in the pytest cache, least recently used ones are dropped above --result-cache-size.
+# --force-run ignores the cache (results are still recorded).
+#
+# The app is found from the marker (@pytest.mark.cacheable(url=...)) or the module's BASE_URL / URL.
+
+import hashlib
+import inspect
+import re
+import time
+from urllib.error import URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import urlopen
+
+import pytest
+from _pytest.reports import TestReport
+from _pytest.runner import CallInfo
+
+RESULTS_KEY = "qa_playground/result_cache"
+MAX_RESOURCES = 50
+LINK_PATTERN = re.compile(r"""(?:src|href)\s*=\s*["']([^"'#]+)["']""", re.IGNORECASE)
+DOCUMENT_SUFFIXES = ("", ".html", ".htm")
+ASSET_SUFFIXES = (".js", ".mjs", ".css")
+
+
+def _fetch(url, timeout=10):
+    with urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+def _suffix(url):
+    name = urlsplit(url).path.rsplit("/", 1)[-1]
+    return name[name.rfind("."):].lower() if "." in name else ""
+
+
+def hash_app(url):
+    """Hashes the page at `url` and everything it references on the same origin (frames/pages under the app too)."""
+    origin = urlsplit(url).netloc
+    app_path = urlsplit(url).path
+    digest = hashlib.sha256()
+    queue, seen = [url], set()
+
+    while queue and len(seen) < MAX_RESOURCES:
+        current = queue.pop(0)
+        if current in seen:
+            continue
+        seen.add(current)
+
+        body = _fetch(current)
+        digest.update(urlsplit(current).path.encode())  # not the host, the mirror/replay proxy port changes
+        digest.update(body)
+
+        if _suffix(current) not in DOCUMENT_SUFFIXES:
+            continue
+        for link in LINK_PATTERN.findall(body.decode("utf-8", errors="replace")):
+            target = urljoin(current, link.strip())
+            parts = urlsplit(target)
+            if parts.netloc != origin:
+                continue
+            # Scripts/styles from anywhere on the site, anything else (pages, frames, images) only from this app
+            if _suffix(target) in ASSET_SUFFIXES or parts.path.startswith(app_path):
+                queue.append(target)
+
+    return digest.hexdigest()
+
+
+def hash_code(rootpath):
+    """Hashes the helpers and the conftest.py files, the code every test runs besides its own module."""
+    digest = hashlib.sha256()
+    paths = sorted((rootpath / "helpers").glob("*.py")) + sorted(rootpath.glob("conftest.py"))
+    paths += sorted(rootpath.glob("*/conftest.py"))
+    for path in paths:
+        digest.update(path.relative_to(rootpath).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, config):
+        self.config = config
+        self.force = config.getoption("--force-run")
+        self.max_entries = config.getoption("--result-cache-size")
+        self.entries = config.cache.get(RESULTS_KEY, {})
+        self.removed = set()
+        self.code_hash = hash_code(config.rootpath)
+        self.app_hashes = {}
+        self.keys = {}
+        self.failed = set()
+        self.hits = 0
+
+    def app_hash(self, url):
+        if url not in self.app_hashes:
+            try:
+                self.app_hashes[url] = hash_app(url)
+            except (URLError, OSError):
+                self.app_hashes[url] = None  # can't tell if the app changed - just run the tests
+        return self.app_hashes[url]
+
+    def key_for(self, item):
+        marker = item.get_closest_marker("cacheable")
+        url = marker.kwargs.get("url") or getattr(item.module, "BASE_URL", None) or getattr(item.module, "URL", None)
+        app_hash = self.app_hash(url) if url else None
+        if app_hash is None:
+            return None
+
+        params = getattr(item, "callspec", None)
+        digest = hashlib.sha256()
+        digest.update(item.nodeid.encode())
+        digest.update(inspect.getsource(item.module).encode())
+        digest.update(repr(sorted(params.params.items()) if params else []).encode())
+        digest.update(app_hash.encode())
+        digest.update(self.code_hash.encode())
+        digest.update(repr(self.options_for(item)).encode())
+        return digest.hexdigest()
+
+    def options_for(self, item):
+        profile = item.get_closest_marker("network_profile")
+        reduced_motion = self.config.getoption("--reduced-motion") and item.get_closest_marker("real_motion") is None
+        return {
+            "network_profile": profile.args[0] if profile else getattr(item.module, "NETWORK_PROFILE", "full"),
+            "reduced_motion": reduced_motion,
+            "replay": self.config.getoption("--replay"),
+        }
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if item.get_closest_marker("cacheable") is None:
+            return None
+
+        key = self.keys[item.nodeid] = self.key_for(item)
+        if self.force or key is None or key not in self.entries:
+            return None
+
+        self.entries[key] = {"nodeid": item.nodeid, "used": time.time()}
+        self.hits += 1
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for when in ("setup", "call"):
+            report = TestReport(
+                item.nodeid,
+                item.location,
+                {keyword: 1 for keyword in item.keywords},
+                "passed",
+                None,
+                when,
+                cached=True,
+            )
+            item.ihook.pytest_runtest_logreport(report=report)
+        # Fixtures the previous test left for this one are still finalized if the next test doesn't need them
+        call = CallInfo.from_call(lambda: item.session._setupstate.teardown_exact(nextitem), when="teardown")
+        report = TestReport.from_item_and_call(item, call)
+        report.cached = True
+        item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        key = self.keys.get(report.nodeid)
+        if key is None or getattr(report, "cached", False):
+            return
+        if report.failed or report.skipped:
+            self.failed.add(report.nodeid)
+            self.entries.pop(key, None)
+            self.removed.add(key)
+        elif report.when == "teardown" and report.nodeid not in self.failed:
+            self.entries[key] = {"nodeid": report.nodeid, "used": time.time()}
+
+    def pytest_report_teststatus(self, report):
+        if getattr(report, "cached", False) and report.when == "call":
+            return "passed", "c", "CACHED"
+        return None
+
+    def pytest_sessionfinish(self):
+        # xdist workers share the cache file - merge with what the others have written since this one started
+        entries = self.config.cache.get(RESULTS_KEY, {})
+        for key in self.removed:
+            entries.pop(key, None)
+        for key, entry in self.entries.items():
+            if key not in entries or entries[key]["used"] < entry["used"]:
+                entries[key] = entry
+        newest = sorted(entries.items(), key=lambda entry: entry[1]["used"], reverse=True)
+        self.config.cache.set(RESULTS_KEY, dict(newest[: self.max_entries]))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.hits:
+            terminalreporter.write_line(f"{self.hits} cacheable tests passed from the result cache (--force-run to run them)")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption(
+        "--force-run",
+        action="store_true",
+        default=False,
+        help="Run @pytest.mark.cacheable tests even if their app and source haven't changed since they passed",
+    )
+    group.addoption(
+        "--result-cache-size",
+        type=int,
+        default=1000,
+        help="How many cached test results to keep, least recently used ones go first (default: 1000)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "cacheable(url=None): the test only depends on the app's content, a pass is reused while it stays the same",
+    )
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(ResultCache(config), "result-cache")
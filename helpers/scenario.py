@@ -0,0 +1,49 @@
+# Scenario state - run an expensive interaction once, let several tests check what it left behind
+# Many tests click through the same flow (open the new tab, open the pop-up and submit it) only to check one thing
+# each at the end. A scenario runs the flow once, records the state the tests need along the way, and every test
+# reads its value from the recorded state. The tests are still reported one by one.
+#
+#     def open_new_tab(driver, record):
+#         record(old_url=driver.current_url)
+#         switch_to_new_tab(driver)
+#         record(new_url=driver.current_url, title=driver.title)
+#
+#     @pytest.fixture(scope="module")
+#     def new_tab(request, driver_pool):
+#         with driver_pool.driver("chrome", base_url=BASE_URL) as driver:
+#             return play(open_new_tab, driver)
+#
+#     def test_title(new_tab):
+#         assert new_tab.title == 'New Page'
+#
+# When the flow fails halfway, what was recorded before still counts: tests reading those values pass, tests
+# reading a value the flow never got to fail with the flow's own error.
+# Only for checks that don't change the page - a test that interacts further needs its own driver.
+
+
+class Scenario:
+    def __init__(self, name):
+        self.name = name
+        self.state = {}
+        self.error = None
+
+    def record(self, **values):
+        self.state.update(values)
+
+    def __getattr__(self, key):
+        state = self.__dict__.get("state", {})
+        if key in state:
+            return state[key]
+        if self.__dict__.get("error") is not None:
+            raise RuntimeError(f"Scenario {self.name} failed before it recorded '{key}'") from self.error
+        raise AttributeError(f"Scenario {self.__dict__.get('name')} has no '{key}'")
+
+
+def play(interaction, driver):
+    """Runs interaction(driver, record) once and returns the Scenario with everything it recorded."""
+    scenario = Scenario(interaction.__name__)
+    try:
+        interaction(driver, scenario.record)
+    except Exception as error:
+        scenario.error = error
+    return scenario
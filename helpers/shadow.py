@@ -0,0 +1,81 @@
+# Piercing selectors for shadow DOM: "progress-bar >>> button"
+# Every ">>>" steps into the shadow root of the elements matched so far, so nested shadow trees are resolved in
+# one execute_script call instead of find_element + shadowRoot + find_element for each level. A segment that
+# starts with ">" only matches direct children of the shadow root ("progress-bar >>> > div").
+#
+# Resolved elements are cached in the page until a MutationObserver sees the document or one of the
+# resolved shadow roots change (nodes, attributes or text), and several queries can be sent at once with shadow_query().
+
+from selenium.common.exceptions import NoSuchElementException
+
+SHADOW_QUERY_JS = """
+const queries = arguments[0];
+
+const state = window.__qaShadowQuery || (window.__qaShadowQuery = (() => {
+    const state = { cache: new Map(), observed: new WeakSet() };
+    state.observer = new MutationObserver(() => state.cache.clear());
+    state.observe = (root) => {
+        if (!state.observed.has(root)) {
+            state.observed.add(root);
+            // Attributes and text too: selectors like [disabled] or :checked can stop matching without a node moving
+            state.observer.observe(root, { childList: true, subtree: true, attributes: true, characterData: true });
+        }
+    };
+    state.observe(document);
+    return state;
+})());
+
+const resolve = (selector) => {
+    const cached = state.cache.get(selector);
+    if (cached && cached.every((el) => el.isConnected)) return cached;
+
+    const segments = selector.split(">>>").map((segment) => segment.trim());
+    let matches = [];
+    let roots = [document];
+    segments.forEach((segment, i) => {
+        matches = roots.flatMap((root) => segment.startsWith(">")
+            ? Array.from(root.children).filter((el) => el.matches(segment.slice(1).trim()))
+            : Array.from(root.querySelectorAll(segment)));
+        if (i < segments.length - 1) {
+            roots = matches.map((host) => host.shadowRoot).filter(Boolean);
+            roots.forEach(state.observe);
+        }
+    });
+
+    // A host that hasn't attached its shadow root yet changes nothing the observer can see, so misses aren't cached
+    if (matches.length) state.cache.set(selector, matches);
+    return matches;
+};
+
+return queries.map(({ selector, style }) => {
+    const elements = resolve(selector);
+    return style ? elements.map((el) => getComputedStyle(el).getPropertyValue(style)) : elements;
+});
+"""
+
+
+def shadow_query(driver, **queries):
+    """Runs several piercing queries in one call.
+
+    Each query is a selector (returns the matching elements) or a (selector, css_property) tuple
+    (returns the computed value of that property for every match):
+
+        found = shadow_query(driver, divs="progress-bar >>> > div", color=("progress-bar >>> button", "color"))
+    """
+    specs = []
+    for query in queries.values():
+        selector, style = (query, None) if isinstance(query, str) else query
+        specs.append({"selector": selector, "style": style})
+
+    return dict(zip(queries, driver.execute_script(SHADOW_QUERY_JS, specs)))
+
+
+def shadow_find_all(driver, selector):
+    return shadow_query(driver, found=selector)["found"]
+
+
+def shadow_find(driver, selector):
+    elements = shadow_find_all(driver, selector)
+    if not elements:
+        raise NoSuchElementException(f"No element matches {selector!r}")
+    return elements[0]
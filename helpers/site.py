@@ -0,0 +1,16 @@
+# The single setting that decides which site the tests run against
+# Test modules build their BASE_URL with app_url(), which reads QA_PLAYGROUND_URL. The root conftest
+# sets it from --site before any test module is imported, so switching to the local mirror is one flag.
+
+import os
+
+LIVE_SITE_URL = "https://qaplayground.dev"
+SITE_URL_ENV = "QA_PLAYGROUND_URL"
+
+
+def site_url():
+    return os.environ.get(SITE_URL_ENV, LIVE_SITE_URL).rstrip("/")
+
+
+def app_url(app, path=""):
+    return f"{site_url()}/apps/{app}/{path}"
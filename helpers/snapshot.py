@@ -0,0 +1,94 @@
+# Snapshot of several elements in one execute_script call
+# Instead of wait visible -> wait clickable -> find_element -> is_displayed -> is_enabled -> .text -> get_attribute
+# (one WebDriver HTTP call each), everything is collected in the page at once and the asserts run in memory.
+
+from dataclasses import dataclass, field
+
+SNAPSHOT_JS = """
+const [locators, styleNames] = arguments;
+
+function find(strategy, value) {
+    switch (strategy) {
+        case "xpath":
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case "css selector":
+            return document.querySelector(value);
+        case "id":
+            return document.getElementById(value);
+        case "name":
+            return document.getElementsByName(value)[0] || null;
+        case "tag name":
+            return document.getElementsByTagName(value)[0] || null;
+        case "class name":
+            return document.getElementsByClassName(value)[0] || null;
+        default:
+            throw new Error(`Unsupported locator strategy: ${strategy}`);
+    }
+}
+
+const result = {};
+for (const [name, [strategy, value]] of Object.entries(locators)) {
+    const el = find(strategy, value);
+    if (!el) {
+        result[name] = null;
+        continue;
+    }
+
+    const rect = el.getBoundingClientRect();
+    const style = getComputedStyle(el);
+    const displayed = rect.width > 0 && rect.height > 0 &&
+        el.checkVisibility({ checkOpacity: true, checkVisibilityCSS: true });
+
+    // Is the element the one that would get a click in its centre (not covered by another element)?
+    const hit = document.elementFromPoint(rect.x + rect.width / 2, rect.y + rect.height / 2);
+
+    result[name] = {
+        tag_name: el.tagName.toLowerCase(),
+        text: displayed ? el.innerText.trim() : "",
+        attributes: Object.fromEntries(Array.from(el.attributes, (a) => [a.name, a.value])),
+        displayed: displayed,
+        enabled: !el.matches(":disabled"),
+        covered: displayed && !(hit && (hit === el || el.contains(hit))),
+        style: Object.fromEntries(styleNames.map((prop) => [prop, style.getPropertyValue(prop)])),
+        rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+    };
+}
+return result;
+"""
+
+DEFAULT_STYLES = ("display", "visibility", "opacity", "color", "background-color")
+
+
+@dataclass
+class ElementSnapshot:
+    tag_name: str
+    text: str
+    attributes: dict = field(default_factory=dict)
+    displayed: bool = False
+    enabled: bool = False
+    covered: bool = False
+    style: dict = field(default_factory=dict)
+    rect: dict = field(default_factory=dict)
+
+    @property
+    def clickable(self):
+        # Same rule as EC.element_to_be_clickable, plus nothing lying on top of the element
+        return self.displayed and self.enabled and not self.covered
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+def snapshot(driver, locators, styles=DEFAULT_STYLES):
+    """Returns {name: ElementSnapshot or None} for {name: (By.XPATH, "...")} locators, in one round-trip."""
+    raw = driver.execute_script(SNAPSHOT_JS, {name: list(locator) for name, locator in locators.items()}, list(styles))
+    return {name: ElementSnapshot(**data) if data else None for name, data in raw.items()}
+
+
+def wait_for_snapshot(wait, locators, styles=DEFAULT_STYLES):
+    """Takes snapshots with the given WebDriverWait until every element exists (e.g. in a page that's still loading)."""
+    def all_found(driver):
+        elements = snapshot(driver, locators, styles)
+        return elements if all(elements.values()) else False
+
+    return wait.until(all_found)
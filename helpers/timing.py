@@ -0,0 +1,205 @@
+# Where does the time go? (pytest --timing)
+# Records, for every test, a timeline of:
+#   phase    - setup / call / teardown of the test
+#   fixture  - setup of each fixture (browser launch happens here)
+#   command  - every Selenium WebDriver command and every Playwright Page/Locator/Browser call
+#   wait     - WebDriverWait/AdaptiveWait.until and Playwright expect() assertions
+# Each test's timeline is written as JSON to --timing-dir, and the slowest commands and waits of the
+# whole run are printed at the end.
+
+import functools
+import json
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+SUMMARY_SIZE = 10
+
+# Playwright calls that only build objects or register handlers, timing them is noise
+PLAYWRIGHT_SKIPPED = {"on", "once", "remove_listener", "locator", "frame_locator", "nth", "filter", "and_", "or_"}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("qa playground")
+    group.addoption("--timing", action="store_true", default=False,
+                    help="Record per-test timelines of fixtures, browser commands and waits")
+    group.addoption("--timing-dir", default=".timings",
+                    help="Folder for the per-test JSON timelines written by --timing (default: .timings)")
+
+
+class TimingPlugin:
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.timeline = None
+        self.events = []
+        self._patches = []
+
+    # Recording #
+
+    def record(self, kind, name, start):
+        end = time.perf_counter()
+        event = {"kind": kind, "name": name, "start": start, "duration": end - start}
+        self.events.append(event)
+        if self.timeline is not None:
+            self.timeline["events"].append(event)
+
+    def timed(self, kind, name, func):
+        plugin = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                plugin.record(kind, name(*args, **kwargs) if callable(name) else name, start)
+
+        return wrapper
+
+    # Instrumentation #
+
+    def patch(self, owner, attribute, kind, name):
+        original = getattr(owner, attribute)
+        self._patches.append((owner, attribute, original))
+        setattr(owner, attribute, self.timed(kind, name, original))
+
+    def patch_public_methods(self, cls, kind):
+        for attribute, value in vars(cls).items():
+            if attribute.startswith(("_", "expect_", "get_by_")) or attribute in PLAYWRIGHT_SKIPPED:
+                continue
+            if callable(value) and not isinstance(value, (property, staticmethod, classmethod)):
+                method_kind = "wait" if attribute.startswith("wait_for") else kind
+                self.patch(cls, attribute, method_kind, f"{cls.__name__}.{attribute}")
+
+    def install(self):
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            from selenium.webdriver.support.wait import WebDriverWait
+        except ImportError:
+            pass
+        else:
+            # Every WebDriver command (including newSession = browser launch) goes through execute()
+            self.patch(WebDriver, "execute", "command", lambda driver, command, *args, **kwargs: command)
+            self.patch(WebDriverWait, "until", "wait", describe_condition)
+            self.patch(WebDriverWait, "until_not", "wait", describe_condition)
+
+            from helpers.adaptive_wait import AdaptiveWait
+            self.patch(AdaptiveWait, "until", "wait", describe_condition)
+            self.patch(AdaptiveWait, "until_not", "wait", describe_condition)
+
+        try:
+            from playwright.sync_api import Browser, BrowserContext, BrowserType, Locator, Page
+            from playwright.sync_api._generated import LocatorAssertions, PageAssertions
+        except ImportError:
+            pass
+        else:
+            for cls in (BrowserType, Browser, BrowserContext, Page, Locator):
+                self.patch_public_methods(cls, "command")
+            for cls in (LocatorAssertions, PageAssertions):
+                self.patch_public_methods(cls, "wait")
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches.clear()
+
+    # Hooks #
+
+    def pytest_runtest_logstart(self, nodeid):
+        self.timeline = {"nodeid": nodeid, "start": time.perf_counter(), "events": []}
+
+    def pytest_runtest_logfinish(self, nodeid):
+        timeline, self.timeline = self.timeline, None
+        if timeline is None:
+            return
+
+        start = timeline["start"]
+        data = {
+            "nodeid": nodeid,
+            "duration": time.perf_counter() - start,
+            "events": [
+                {**event, "start": event["start"] - start} for event in timeline["events"]
+            ],
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        filename = re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + ".json"
+        (self.output_dir / filename).write_text(json.dumps(data, indent=2))
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self.record("fixture", fixturedef.argname, start)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item):
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self.record("phase", "setup", start)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self.record("phase", "call", start)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(self, item):
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self.record("phase", "teardown", start)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for kind in ("command", "wait", "fixture"):
+            totals = defaultdict(lambda: [0, 0.0, 0.0])
+            for event in self.events:
+                if event["kind"] == kind:
+                    total = totals[event["name"]]
+                    total[0] += 1
+                    total[1] += event["duration"]
+                    total[2] = max(total[2], event["duration"])
+            if not totals:
+                continue
+
+            terminalreporter.section(f"slowest {kind}s")
+            terminalreporter.write_line(f"{'total s':>9}{'count':>7}{'avg ms':>9}{'max ms':>9}  name")
+            slowest = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:SUMMARY_SIZE]
+            for name, (count, total, longest) in slowest:
+                terminalreporter.write_line(
+                    f"{total:>9.2f}{count:>7}{total / count * 1000:>9.1f}{longest * 1000:>9.1f}  {name}"
+                )
+        terminalreporter.write_line(f"Per-test timelines: {self.output_dir}/")
+
+
+def describe_condition(wait, method, *args, **kwargs):
+    # EC conditions are closures - name them after the EC function and the locator they check
+    name = getattr(method, "__qualname__", repr(method)).split(".<locals>")[0]
+    for cell in getattr(method, "__closure__", None) or ():
+        contents = cell.cell_contents
+        if isinstance(contents, tuple) and len(contents) == 2 and all(isinstance(part, str) for part in contents):
+            return f"{name}{contents}"
+    return name
+
+
+def pytest_configure(config):
+    if config.getoption("--timing"):
+        plugin = TimingPlugin(config.getoption("--timing-dir"))
+        plugin.install()
+        config.pluginmanager.register(plugin, "timing")
+
+
+def pytest_unconfigure(config):
+    plugin = config.pluginmanager.get_plugin("timing")
+    if plugin is not None:
+        plugin.uninstall()
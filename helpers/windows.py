@@ -0,0 +1,111 @@
+# Window events for Selenium, the counterpart of Playwright's context.expect_page()
+#
+#     with expect_new_window(driver) as popup:
+#         driver.find_element(...).click()
+#     driver.switch_to.window(popup.value)
+#
+#     with expect_window_closed(driver, popup.value):
+#         driver.find_element(...).click()
+#
+# The pool starts browsers with WebDriver BiDi enabled (the webSocketUrl capability), and the browser then pushes
+# browsingContext.contextCreated/contextDestroyed events to us: the wait ends as soon as the window exists, with
+# its handle, instead of asking for window_handles every 0.5 s. Drivers without BiDi (attached to the browser
+# daemon, older Selenium) fall back to checking window_handles every POLL_INTERVAL seconds.
+
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+POLL_INTERVAL = 0.02
+
+
+class WindowEvent:
+    """Filled in when the `with` block of expect_new_window/expect_window_closed ends."""
+
+    def __init__(self):
+        self._handle = None
+        self._done = threading.Event()
+
+    def resolve(self, handle):
+        if not self._done.is_set():
+            self._handle = handle
+            self._done.set()
+
+    def wait(self, timeout):
+        return self._done.wait(timeout)
+
+    @property
+    def value(self):
+        if not self._done.is_set():
+            raise RuntimeError("The window event is only known after the `with` block")
+        return self._handle
+
+
+def bidi_enabled(driver):
+    return bool(driver.capabilities.get("webSocketUrl"))
+
+
+def subscribe(driver, event, callback):
+    """Calls `callback(handle)` for BiDi `event` on top-level windows. Returns an unsubscribe function or None."""
+    if not bidi_enabled(driver):
+        return None
+
+    def on_event(info):
+        if info.parent is None:  # iframes are browsing contexts too
+            callback(info.context)
+
+    try:
+        browsing_context = driver.browsing_context
+        callback_id = browsing_context.add_event_handler(event, on_event)
+    except (AttributeError, WebDriverException):  # Selenium without the BiDi browsingContext module
+        return None
+    return lambda: browsing_context.remove_event_handler(event, callback_id)
+
+
+def poll(driver, check, timeout, message):
+    deadline = time.monotonic() + timeout
+    while True:
+        result = check(driver.window_handles)
+        if result is not None:
+            return result
+        if time.monotonic() > deadline:
+            raise TimeoutException(message)
+        time.sleep(POLL_INTERVAL)
+
+
+@contextmanager
+def expect_new_window(driver, timeout=10):
+    """Waits for the block to open a window (pop-up or tab) and gives its handle as `.value`."""
+    event = WindowEvent()
+    known = set(driver.window_handles)
+    unsubscribe = subscribe(driver, "context_created", event.resolve)
+    message = f"No new window was opened in {timeout} s"
+    try:
+        yield event
+        if unsubscribe is None:
+            event.resolve(poll(driver, lambda handles: next((h for h in handles if h not in known), None), timeout, message))
+        elif not event.wait(timeout):
+            raise TimeoutException(message)
+    finally:
+        if unsubscribe is not None:
+            unsubscribe()
+
+
+@contextmanager
+def expect_window_closed(driver, handle=None, timeout=10):
+    """Waits for the block to close window `handle` (the current one by default)."""
+    handle = handle or driver.current_window_handle
+    event = WindowEvent()
+    unsubscribe = subscribe(driver, "context_destroyed", lambda closed: closed == handle and event.resolve(closed))
+    message = f"Window {handle} wasn't closed in {timeout} s"
+    try:
+        yield event
+        if unsubscribe is None:
+            event.resolve(poll(driver, lambda handles: handle if handle not in handles else None, timeout, message))
+        elif not event.wait(timeout):
+            raise TimeoutException(message)
+    finally:
+        if unsubscribe is not None:
+            unsubscribe()
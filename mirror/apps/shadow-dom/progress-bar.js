@@ -0,0 +1,62 @@
+class ProgressBar extends HTMLElement {
+    static get observedAttributes() {
+        return ["percent"];
+    }
+
+    constructor() {
+        super();
+        this.attachShadow({ mode: "open" });
+        this.shadowRoot.innerHTML = `
+            <style>
+                :host { display: block; width: 400px; }
+                .progress { height: 24px; border-radius: 12px; background: #31354a; overflow: hidden; }
+                .progress-bar { height: 100%; width: 0; background: #22c55e; transition: width 0.3s ease; }
+                .btn-wrapper { display: flex; justify-content: center; margin-top: 2rem; }
+                button {
+                    padding: 0.75rem 2.5rem; border: none; border-radius: 6px; background: #4f46e5;
+                    color: #fff; font-size: 1rem; text-transform: uppercase; cursor: pointer;
+                }
+            </style>
+            <div class="progress">
+                <div class="progress-bar"></div>
+            </div>
+            <div class="btn-wrapper">
+                <button>Boost 🚀</button>
+            </div>
+        `;
+        this.bar = this.shadowRoot.querySelector(".progress-bar");
+        this.shadowRoot.querySelector("button").addEventListener("click", () => this.boost());
+    }
+
+    connectedCallback() {
+        this.render();
+    }
+
+    attributeChangedCallback() {
+        this.render();
+    }
+
+    get percent() {
+        return Number(this.getAttribute("percent")) || 0;
+    }
+
+    render() {
+        this.bar.style.width = `${this.percent}%`;
+    }
+
+    // Fills the bar up to 95% one percent at a time; clicks during the animation are ignored
+    boost() {
+        if (this.timer || this.percent >= 95) return;
+
+        this.timer = setInterval(() => {
+            const next = Math.min(this.percent + 1, 95);
+            this.setAttribute("percent", String(next));
+            if (next >= 95) {
+                clearInterval(this.timer);
+                this.timer = null;
+            }
+        }, 50);
+    }
+}
+
+customElements.define("progress-bar", ProgressBar);
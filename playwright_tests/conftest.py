@@ -0,0 +1,168 @@
+from functools import partial
+
+import pytest
+
+from helpers.async_matrix import AsyncPageMatrix
+from helpers.browser_daemon import cdp_endpoint, is_headed
+from helpers.dom_snapshot import capture
+from helpers.motion import apply_playwright, reduced_motion_for
+from helpers.network import FULL, profile_for, route_playwright
+from helpers.page_pool import WarmPagePool
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "concurrent_matrix(replaces): module runs its cases concurrently with --concurrent-matrix, "
+        "instead of the sequential module `replaces`",
+    )
+
+
+# With --concurrent-matrix the concurrent modules run and the sequential modules they replace are deselected,
+# without it it's the other way round - the same cases never run twice
+def pytest_collection_modifyitems(config, items):
+    concurrent = config.getoption("--concurrent-matrix")
+    replaced = {
+        marker.kwargs["replaces"]
+        for item in items
+        for marker in item.iter_markers("concurrent_matrix")
+    }
+
+    selected, deselected = [], []
+    for item in items:
+        if item.get_closest_marker("concurrent_matrix"):
+            keep = concurrent
+        else:
+            keep = not (concurrent and item.path.name in replaced)
+        (selected if keep else deselected).append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def daemon_endpoint(config, browser_name):
+    # --headed runs only attach when the daemon was started with --headed too, otherwise they launch their own
+    if config.getoption("--no-browser-daemon") or browser_name != "chromium":
+        return None
+    if config.getoption("--headed", False) and not is_headed():
+        return None
+    return cdp_endpoint()
+
+
+# Overrides pytest-playwright's browser: attach to the browser daemon's Chrome when it's running.
+# Tests still get their own context (new_context), only the browser process is shared.
+@pytest.fixture(scope="session")
+def browser(pytestconfig, playwright, browser_name, launch_browser):
+    endpoint = daemon_endpoint(pytestconfig, browser_name)
+    browser = playwright.chromium.connect_over_cdp(endpoint) if endpoint else launch_browser()
+    yield browser
+    browser.close()  # for an attached browser this only disconnects
+
+
+@pytest.fixture(scope="session")
+def async_page_matrix(pytestconfig, browser_name, browser_type_launch_args, browser_context_args):
+    def make(url, network_profile=FULL, reduced_motion=False):
+        return AsyncPageMatrix(
+            url,
+            browser_name=browser_name,
+            launch_args=browser_type_launch_args,
+            context_args=browser_context_args,
+            concurrency=pytestconfig.getoption("--matrix-concurrency"),
+            network_profile=network_profile,
+            reduced_motion=reduced_motion,
+            network_stats=pytestconfig.network_stats,
+            har_proxy=pytestconfig.har_proxy,
+            cdp_endpoint=daemon_endpoint(pytestconfig, browser_name),
+        )
+
+    return make
+
+
+# CONTEXTS #
+
+def setup_context(config, context, network_profile, reduced_motion=False):
+    # The last registered route runs first: the network profile blocks what it doesn't want and lets the rest
+    # fall back to the --replay archive
+    if config.har_proxy is not None:
+        config.har_proxy.route_playwright(context)
+    route_playwright(context, network_profile, config.network_stats)
+    if reduced_motion:
+        apply_playwright(context)
+
+
+# DOM SNAPSHOTS #
+
+# Static DOM tier - every app is rendered and snapshotted once per run, static checks query the snapshot.
+# dom_snapshot(url) opens the app in a throwaway context the first time and returns the same snapshot after.
+@pytest.fixture(scope="session")
+def dom_snapshot(pytestconfig, browser, browser_context_args):
+    pytest.importorskip("lxml")
+    snapshots = {}
+
+    def get(url):
+        if url not in snapshots:
+            context = browser.new_context(**browser_context_args)
+            try:
+                setup_context(pytestconfig, context, FULL)
+                page = context.new_page()
+                page.goto(url)
+                snapshots[url] = capture(page)
+            finally:
+                context.close()
+        return snapshots[url]
+
+    return get
+
+
+# WARM PAGES #
+
+def warm_pages_enabled(config):
+    # Pool pages live outside pytest-playwright's own contexts, so there would be no traces/videos/screenshots
+    artifacts = [config.getoption(name, "off") for name in ("--tracing", "--video", "--screenshot")]
+    return config.getoption("--warm-pages") > 0 and all(artifact == "off" for artifact in artifacts)
+
+
+@pytest.fixture(scope="module")
+def warm_page_pool(request, browser, browser_context_args):
+    url = getattr(request.module, "BASE_URL", None) or getattr(request.module, "URL", None)
+    if url is None or not warm_pages_enabled(request.config):
+        yield None
+        return
+
+    pool = WarmPagePool(
+        browser,
+        url,
+        request.config.getoption("--warm-pages"),
+        browser_context_args,
+        network_profile=profile_for(request),
+        reduced_motion=reduced_motion_for(request),
+        setup_context=partial(setup_context, request.config),
+    )
+    yield pool
+    pool.close()
+
+
+# Overrides pytest-playwright's page/context: with the pool the page comes pre-navigated to the module's app.
+# A test with its own network_profile or real_motion marker can't use the module's pooled pages.
+@pytest.fixture
+def page(request, warm_page_pool, new_context):
+    profile, reduced_motion = profile_for(request), reduced_motion_for(request)
+    if (
+        warm_page_pool is None
+        or warm_page_pool.network_profile != profile
+        or warm_page_pool.reduced_motion != reduced_motion
+    ):
+        context = new_context()
+        setup_context(request.config, context, profile, reduced_motion)
+        yield context.new_page()
+        return
+
+    page = warm_page_pool.acquire()
+    yield page
+    page.context.close()
+
+
+@pytest.fixture
+def context(page):
+    return page.context
@@ -1,8 +1,11 @@
 import pytest
-import requests
 from playwright.sync_api import Page, BrowserContext, expect
 
-BASE_URL = "https://qaplayground.dev/apps/popup/"
+from helpers.page_pool import open_app
+from helpers.site import app_url
+
+BASE_URL = app_url("popup")
+NETWORK_PROFILE = "minimal"
 OPEN_BUTTON_XPATH = ".//div[@class='flex-center']/a"
 POPUP_BUTTON_XPATH = ".//div/button"
 MAIN_TEXT_XPATH = ".//div[@class='flex-center']/p"
@@ -10,11 +13,12 @@ MAIN_TEXT_XPATH = ".//div[@class='flex-center']/p"
 
 @pytest.fixture(scope="function", autouse=True)
 def go_to_main(page: Page):
-    page.goto(BASE_URL)
+    open_app(page, BASE_URL)
     page.wait_for_selector(f"xpath={MAIN_TEXT_XPATH}")
     yield
 
 
+@pytest.mark.cacheable
 def test_main_text_is_what_is_expected(page: Page, expected_text="Click to open pop-up"):
     text = page.locator(f"xpath={MAIN_TEXT_XPATH}").inner_text()
     assert text == expected_text, f"Real text is {text!r}, expected {expected_text!r}"
@@ -26,6 +30,7 @@ def test_open_button_is_clickable(page: Page):
     expect(btn).to_be_enabled()
 
 
+@pytest.mark.cacheable
 def test_open_button_text_is_what_is_expected(page: Page, expected_text="OPEN"):
     text = page.locator(f"xpath={OPEN_BUTTON_XPATH}").inner_text()
     assert text == expected_text, f"Real text is {text!r}, expected {expected_text!r}"
@@ -99,11 +104,11 @@ def test_URL_of_the_pop_up_page_is_changed_to_what_is_expected(page: Page, conte
     assert popup.url.endswith(expected_url_ending), f"Real URL is {popup.url!r}, expected to end with {expected_url_ending!r}"
 
 
-def test_HTTPS_request_of_open_button_is_200():
-    response = requests.get(BASE_URL)
-    assert response.status_code == 200
+@pytest.mark.http_check(BASE_URL)
+def test_HTTPS_request_of_open_button_is_200(http_response):
+    assert http_response.status_code == 200
 
 
-def test_HTTPS_request_of_submit_button_is_200():
-    response = requests.get(BASE_URL + "popup")
-    assert response.status_code == 200
\ No newline at end of file
+@pytest.mark.http_check(BASE_URL + "popup")
+def test_HTTPS_request_of_submit_button_is_200(http_response):
+    assert http_response.status_code == 200
\ No newline at end of file
@@ -0,0 +1,41 @@
+# URL = https://qaplayground.dev/apps/rating/
+# The same test cases as test_rating.py (both are generated from helpers/rating_cases.py), played with
+# Playwright's async API so the whole star matrix (~50 cases, one page load each) runs concurrently in a
+# single browser.
+# Runs instead of test_rating.py with --concurrent-matrix (--matrix-concurrency sets how many pages at once).
+# Every case gets its own context and page, so console errors are still collected per case.
+
+from functools import partial
+
+import pytest
+
+from helpers.cases import run_async
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.rating_cases import CASES
+from helpers.site import app_url
+
+pytestmark = pytest.mark.concurrent_matrix(replaces="test_rating.py")
+
+URL = app_url("rating")
+NETWORK_PROFILE = "assets-needed"
+
+# TESTS #
+
+@pytest.fixture(scope="module")
+def outcomes(request, async_page_matrix):
+    # Only the cases left after -k/deselection run
+    selected = {
+        item.callspec.params["case_id"]
+        for item in request.session.items
+        if item.module is request.module and hasattr(item, "callspec")
+    }
+    cases = {case_id: partial(run_async, steps) for case_id, steps in CASES.items() if case_id in selected}
+    return async_page_matrix(URL, profile_for(request), reduced_motion_for(request)).run(cases)
+
+# Each case is still reported as its own test, e.g. test_rating_case[feedback_text_matches-3]
+@pytest.mark.parametrize("case_id", list(CASES))
+def test_rating_case(outcomes, case_id):
+    error = outcomes[case_id]
+    if error is not None:
+        raise error
@@ -11,11 +11,15 @@
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = 'https://qaplayground.dev/apps/tags-input-box/'
+from helpers.page_pool import open_app
+from helpers.site import app_url
+
+BASE_URL = app_url('tags-input-box')
+NETWORK_PROFILE = 'minimal'
 
 @pytest.fixture(scope="function", autouse=True)
 def visit_page(page: Page):
-    page.goto(BASE_URL)
+    open_app(page, BASE_URL)
     page.wait_for_selector(".content")  # wait for the main content area to be visible
 
 def test_tag_is_saved_and_displayed_after_entering_value(page: Page):
@@ -0,0 +1,37 @@
+import pytest
+
+from helpers.dom_snapshot import capture
+from helpers.driver_pool import DriverPool
+from helpers.network import filters_anything
+
+
+# One pool for the whole session - every module's `driver` fixture borrows its browser from here
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    selenium_items = [item for item in request.session.items if "driver_pool" in item.fixturenames]
+    pool = DriverPool(
+        reuse=not request.config.getoption("--no-driver-pool"),
+        network_stats=request.config.network_stats,
+        use_daemon=not request.config.getoption("--no-browser-daemon"),
+        har_proxy=request.config.har_proxy,
+        # Chrome's performance log only when a selected Selenium test runs with a filtering network profile
+        performance_log=filters_anything(selenium_items),
+    )
+    yield pool
+    pool.close()
+
+
+# Static DOM tier - every app is rendered and snapshotted once per run, static checks query the snapshot.
+# dom_snapshot(url) opens the app in a pooled headless Chrome the first time and returns the same snapshot after.
+@pytest.fixture(scope="session")
+def dom_snapshot(driver_pool):
+    pytest.importorskip("lxml")
+    snapshots = {}
+
+    def get(url):
+        if url not in snapshots:
+            with driver_pool.driver("chrome", headless=True, base_url=url) as driver:
+                snapshots[url] = capture(driver)
+        return snapshots[url]
+
+    return get
@@ -10,21 +10,23 @@
 import time
 
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 
-BASE_URL = 'https://qaplayground.dev/apps/verify-account/'
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.site import app_url
+
+BASE_URL = app_url('verify-account')
+NETWORK_PROFILE = 'minimal'
 
 @pytest.fixture
-def driver():
-    options = Options()
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(options=options)
-    yield driver
-    driver.quit()
+def driver(request, driver_pool):
+    with driver_pool.driver(
+        'chrome', network_profile=profile_for(request), reduced_motion=reduced_motion_for(request)
+    ) as driver:
+        yield driver
 
 def test_code_confirmation_shows_success_after_valid_code(driver):
     driver.get(BASE_URL)
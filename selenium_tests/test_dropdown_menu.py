@@ -4,107 +4,136 @@
 
 # Test cases plan:
 # 1. Every element of the dropdown menu is clickable
+# 2. There are no menu items without a test
 
-from selenium import webdriver
+# The menu tree is discovered from the page and every leaf is clicked in one browser session: between the
+# leaves the dropdown is closed and opened again instead of reloading the page. Each leaf is still its own test.
+
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.chrome.options import Options
-import time
 import pytest
 
-BASE_URL = 'https://qaplayground.dev/apps/multi-level-dropdown/' # URL of the page with the task on QA playground
-
-# This sets up the browser. It opens the site before the tests start and closes it after all are done.
-@pytest.fixture
-def driver():
-    options = Options()
-    options.add_argument("--start-maximized")  
-
-    driver = webdriver.Chrome(options=options)  
-    driver.get(BASE_URL)
-    yield driver
-    driver.quit()
-
-def open_dropdown_and_click(driver, first_index, second_index=None):
-    # Open nav
-    nav = driver.find_element(By.XPATH, ".//ul/li[last()]")
+from helpers.clock import install_clock
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.site import app_url
+
+BASE_URL = app_url('multi-level-dropdown') # URL of the page with the task on QA playground
+NETWORK_PROFILE = "minimal"
+
+NAV_XPATH = ".//ul/li[last()]"
+DROPDOWN_XPATH = ".//div[@class='dropdown']"
+# The live app's CSSTransition adds classes to the menus (menu menu-secondary-enter-done), so no exact @class match
+MENU_XPATH = f"{DROPDOWN_XPATH}/div[contains(concat(' ', @class, ' '), ' menu ')]"
+
+# Label (without the icons) of every item in the open menu, and whether it opens another menu (has a right icon)
+MENU_ITEMS_JS = """
+return Array.from(document.querySelectorAll('.dropdown .menu a')).map((item) => {
+    const copy = item.cloneNode(true);
+    copy.querySelectorAll('[class*="icon"]').forEach((icon) => icon.remove());
+    return { label: copy.textContent.trim(), opener: item.querySelector('.icon-right') !== null };
+});
+"""
+
+# Menu path of every leaf -> URL ending after clicking it
+EXPECTED_FRAGMENTS = {
+    "My Profile": "#undefined",
+    "My Tutorial/My Tutorial": "#main",  # back button
+    "My Tutorial/HTML": "#!HTML",
+    "My Tutorial/CSS": "#!CSS",
+    "My Tutorial/JavaScript": "#!JavaScript",
+    "My Tutorial/Awesome!": "#!Awesome",  # Supposed to come out FAILED since footer's infobox is covering the button -- Bug
+    "Animals/Animals": "#main",  # back button
+    "Animals/Kangaroo": "#!Kangaroo",
+    "Animals/Frog": "#!Frog",
+    "Animals/Horse": "#!Horse",
+    "Animals/Hedgehog": "#!Hedgehog",  # Supposed to come out as FAILED since footer inbox-message is covering the button -- Bug
+}
+
+# HELPER FUNCTIONS #
+
+def open_menu(driver):
+    nav = driver.find_element(By.XPATH, NAV_XPATH)
     nav.click()
     WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.XPATH, ".//div[@class='dropdown']"))
+        EC.visibility_of_element_located((By.XPATH, DROPDOWN_XPATH))
     )
-    time.sleep(0.5) # Wait for the animation
-
-    # First layer (e.g. "Profile", "My Tutorials", "Animals")
-    first_button = driver.find_element(By.XPATH, f".//div[@class='menu']/a[{first_index}]")
-    first_button.click()
-
-    # Second layer (if there is one)
-    if second_index is not None:
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, ".//div[@class='dropdown']"))
-        )
-        time.sleep(0.5) # Wait for the animation
-
-        second_button = driver.find_element(By.XPATH, f".//div[@class='dropdown']/div/a[{second_index}]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", second_button)
-        second_button.click()
-        # time.sleep(1) # Wait for the link
-
-def test_dropdownmenu_profile_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=1, second_index=None)
-
-    # Check that something happened (page changed, element appeared, etc)
-    assert driver.current_url.endswith("#undefined")
-
-def test_dropdownmenu_MyTutorialBack_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=2, second_index=1)
-    assert driver.current_url.endswith("#main")
-
-def test_dropdownmenu_HTML_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=2, second_index=2)
-
-    assert driver.current_url.endswith("#!HTML")
+    install_clock(driver).run_all() # Jump to the end of the animation
+
+def reset_menu(driver):
+    # Close the dropdown if it's open and forget the last clicked link - no page reload needed
+    try:
+        if driver.find_elements(By.XPATH, DROPDOWN_XPATH):
+            driver.find_element(By.XPATH, NAV_XPATH).click()
+        driver.execute_script("history.replaceState(null, '', location.pathname + location.search);")
+        open_menu(driver)
+    except WebDriverException:
+        # The menu got stuck somewhere - start over from a fresh page
+        driver.get(BASE_URL)
+        open_menu(driver)
+
+def click_menu_item(driver, path):
+    # path = 1-based item indexes, one per menu level, e.g. (2, 5) = "My Tutorial" -> "Awesome!"
+    reset_menu(driver)
+    for level, index in enumerate(path, start=1):
+        item = driver.find_element(By.XPATH, f"{MENU_XPATH}/a[{index}]")
+        if level > 1:
+            driver.execute_script("arguments[0].scrollIntoView(true);", item)
+        item.click()
+        if level < len(path):
+            install_clock(driver).run_all() # The next menu has slid in
+
+def discover_leaves(driver, path=(), labels=(), max_depth=3):
+    # {"My Tutorial/HTML": (2, 2), ...} for every item that doesn't open another menu
+    if path:
+        click_menu_item(driver, path)
+        # The menu that slid out is only unmounted by a (virtual) timer, its items mustn't mix with the new ones
+        install_clock(driver).run_all()
+    else:
+        reset_menu(driver)
+
+    leaves = {}
+    for index, item in enumerate(driver.execute_script(MENU_ITEMS_JS), start=1):
+        item_path, item_labels = path + (index,), labels + (item["label"],)
+        if item["opener"] and len(item_path) < max_depth:
+            leaves.update(discover_leaves(driver, item_path, item_labels, max_depth))
+        else:
+            leaves["/".join(item_labels)] = item_path
+    return leaves
+
+# One browser for the whole module: discover the menu, click every leaf, keep the URL (or the error) of each
+@pytest.fixture(scope="module")
+def crawled_menu(request, driver_pool):
+    with driver_pool.driver(
+        "chrome", base_url=BASE_URL, network_profile=profile_for(request), reduced_motion=reduced_motion_for(request)
+    ) as driver:
+        outcomes = {}
+        for label, path in discover_leaves(driver).items():
+            try:
+                click_menu_item(driver, path)
+                outcomes[label] = driver.current_url
+            except WebDriverException as error:  # e.g. the click is intercepted by the footer
+                outcomes[label] = error
+        yield outcomes
+
+# TESTS #
 
-def test_dropdownmenu_CSS_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=2, second_index=3)
-
-    assert driver.current_url.endswith("#!CSS")
-
-def test_dropdownmenu_JavaScript_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=2, second_index=4)
-    assert driver.current_url.endswith("#!JavaScript")
-
-
-# Supposed to come out FAILED since footer's infobox is covering the button -- Bug
-def test_dropdownmenu_Awesome_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=2, second_index=5)
-
-    assert driver.current_url.endswith("#!Awesome")
-
-def test_dropdownmenu_AnimalsBack_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=3, second_index=1)
-
-    assert driver.current_url.endswith("#main")
-
-def test_dropdownmenu_Kangaroo_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=3, second_index=2)
-
-    assert driver.current_url.endswith("#!Kangaroo")
-
-def test_dropdownmenu_Frog_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=3, second_index=3)
-
-    assert driver.current_url.endswith("#!Frog")
+# 1. Every element of the dropdown menu is clickable
+@pytest.mark.parametrize("leaf", EXPECTED_FRAGMENTS)
+def test_dropdownmenu_item_is_clickable(crawled_menu, leaf):
+    assert leaf in crawled_menu, f"{leaf} is not in the menu"
 
-def test_dropdownmenu_Horse_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=3, second_index=4)
+    outcome = crawled_menu[leaf]
+    if isinstance(outcome, Exception):
+        raise outcome
 
-    assert driver.current_url.endswith("#!Horse")
+    assert outcome.endswith(EXPECTED_FRAGMENTS[leaf])
 
-# Supposed to come out as FAILED since footer inbox-message is covering the button -- Bug
-def test_dropdownmenu_Hedgehod_button_is_clickable(driver):
-    open_dropdown_and_click(driver, first_index=3, second_index=5)
+# 2. There are no menu items without a test
+def test_dropdownmenu_has_no_untested_items(crawled_menu):
+    untested = set(crawled_menu) - set(EXPECTED_FRAGMENTS)
 
-    assert driver.current_url.endswith("#!Hedgehod")
\ No newline at end of file
+    assert not untested, f"Menu items without an expected URL: {sorted(untested)}"
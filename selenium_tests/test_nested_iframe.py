@@ -21,71 +21,59 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 import pytest
-import requests
 import time
 
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-
-BASE_URL = "https://qaplayground.dev/apps/iframe/"
-FIRST_IFRAME_XPATH = './/iframe[@src="iframe1.html"]'
-SECOND_IFRAME_XPATH = './/iframe[@src="iframe2.html"]'
+from helpers.adaptive_wait import AdaptiveWait
+from helpers.dom_snapshot import displayed, text
+from helpers.frames import FramePath
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.site import app_url
+
+BASE_URL = app_url("iframe")
+NETWORK_PROFILE = "minimal"
+pytestmark = pytest.mark.browser_matrix
+FIRST_IFRAME = 'iframe[src="iframe1.html"]'
+SECOND_IFRAME = 'iframe[src="iframe2.html"]'
+SECOND_FRAME_PATH = FramePath(FIRST_IFRAME, SECOND_IFRAME)  # main page -> iframe1.html -> iframe2.html
+# The same path in the DOM snapshot, where each frame's document sits inline under <frame-document>
+FIRST_IFRAME_XPATH = '//iframe[@src="iframe1.html"]'
+SECOND_IFRAME_XPATH = '//iframe[@src="iframe2.html"]'
+SECOND_FRAME_XPATH = FIRST_IFRAME_XPATH + '/frame-document' + SECOND_IFRAME_XPATH + '/frame-document'
 
 @pytest.fixture(params=["chrome", "firefox"])
-def driver(request) -> webdriver.Chrome | webdriver.Firefox: # type: ignore
-    browser = request.param
-
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.add_argument("--headless")
-        driver = webdriver.Chrome(options=options)
-
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        options.add_argument("--start-maximized")
-        options.add_argument("--headless")
-        driver = webdriver.Firefox(options=options)
-
-    else:
-        raise Exception(f"Unsupported browser: {browser}")
-
-    driver.get(BASE_URL)
-    yield driver
-    driver.quit()
+def driver(request, driver_pool) -> webdriver.Chrome | webdriver.Firefox: # type: ignore
+    with driver_pool.driver(
+        request.param,
+        headless=True,
+        base_url=BASE_URL,
+        network_profile=profile_for(request),
+        reduced_motion=reduced_motion_for(request),
+    ) as driver:
+        yield driver
 
 # HELPER FUNCTIONS #
 
-def switch_to_frame_by_xpath(driver, xpath, timeout=10):
-    WebDriverWait(driver, timeout).until(
-        EC.frame_to_be_available_and_switch_to_it((By.XPATH, xpath))
-    )
-
-def get_to_the_second_frame(driver, first_iframe_xpath=FIRST_IFRAME_XPATH, second_iframe_xpath=SECOND_IFRAME_XPATH):
-    switch_to_frame_by_xpath(driver, first_iframe_xpath)
-    switch_to_frame_by_xpath(driver, second_iframe_xpath)
+def get_to_the_second_frame(driver):
+    # No-op when the driver is already there, otherwise only the missing hops
+    SECOND_FRAME_PATH.enter(driver)
 
 # TESTS #
 
 # 1. Text on the button is what is expected
-def test_text_on_the_button_is_what_is_expected(driver, expected_text='CLICK ME'):
-    driver.switch_to.default_content()
-
-    get_to_the_second_frame(driver)
-
-    button_text = driver.find_element(By.TAG_NAME, 'a').text
+@pytest.mark.cacheable
+def test_text_on_the_button_is_what_is_expected(dom_snapshot, expected_text='CLICK ME'):
+    # The snapshot has both frame documents inline, no frame switching (or browser) needed
+    button = dom_snapshot(BASE_URL).first(SECOND_FRAME_XPATH + '//a')
+    button_text = text(button)
 
     assert button_text == expected_text, \
         f'The text on the button is {button_text}, but supposed to be {expected_text}'
     
 # 2. Button is visible and clickable
 def test_button_is_visible_and_clickable(driver):
-    driver.switch_to.default_content()
-
     get_to_the_second_frame(driver)
 
     button = driver.find_element(By.TAG_NAME, 'a')
@@ -95,9 +83,7 @@ def test_button_is_visible_and_clickable(driver):
 
 # 3. Expected text is appeared after the click on the button
 def test_expected_text_is_appeared_after_clicking_the_button(driver):
-    wait = WebDriverWait(driver, 10)
-
-    driver.switch_to.default_content()
+    wait = AdaptiveWait(driver, 10)
 
     get_to_the_second_frame(driver)
 
@@ -113,9 +99,7 @@ def test_expected_text_is_appeared_after_clicking_the_button(driver):
 
 # 4. No duplicate texts are shown after repeated button clicks
 def test_no_duplicate_texts_are_shown_after_clicking_the_button(driver):
-    wait = WebDriverWait(driver, 10)
-
-    driver.switch_to.default_content()
+    wait = AdaptiveWait(driver, 10)
 
     get_to_the_second_frame(driver)
 
@@ -130,29 +114,25 @@ def test_no_duplicate_texts_are_shown_after_clicking_the_button(driver):
     assert len(texts) == 1, 'There are more than 1 text'
 
 # 5. First layer iframe's HTTPS response is 2xx
-def test_https_response_of_first_layer_iframe_is_2xx():
-    response = requests.get('https://qaplayground.dev/apps/iframe/iframe1')
-
-    assert response.ok, "First layer iframe's response code is not 2xx"
+@pytest.mark.http_check(BASE_URL + 'iframe1')
+def test_https_response_of_first_layer_iframe_is_2xx(http_response):
+    assert http_response.ok, "First layer iframe's response code is not 2xx"
 
 
 # 6. Second layer iframe's HTTPS response is 2xx
-def test_https_response_of_second_layer_iframe_is_2xx():
-    response = requests.get('https://qaplayground.dev/apps/iframe/iframe2')
-
-    assert response.ok, "Second layer iframe's response code is not 2xx"
+@pytest.mark.http_check(BASE_URL + 'iframe2')
+def test_https_response_of_second_layer_iframe_is_2xx(http_response):
+    assert http_response.ok, "Second layer iframe's response code is not 2xx"
 
 # 7. Iframe structure doesn't change
-def test_iframe_structure_does_not_change(driver):
-
-    driver.switch_to.default_content()
+@pytest.mark.cacheable
+def test_iframe_structure_does_not_change(dom_snapshot):
+    dom = dom_snapshot(BASE_URL)
 
     # Check iframe1 is present in main pagae
-    iframe1 = driver.find_element(By.XPATH, '//iframe[@src="iframe1.html"]')
-    assert iframe1.is_displayed(), "iframe1 is not visible or present"
-
-    driver.switch_to.frame(iframe1)
+    iframe1 = dom.first(FIRST_IFRAME_XPATH)
+    assert iframe1 is not None and displayed(iframe1), "iframe1 is not visible or present"
 
     # Inside iframe1, check for iframe2
-    iframe2 = driver.find_element(By.XPATH, '//iframe[@src="iframe2.html"]')
-    assert iframe2.is_displayed(), "iframe2 is not visible or present inside iframe1"
+    iframe2 = dom.first(FIRST_IFRAME_XPATH + '/frame-document' + SECOND_IFRAME_XPATH)
+    assert iframe2 is not None and displayed(iframe2), "iframe2 is not visible or present inside iframe1"
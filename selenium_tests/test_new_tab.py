@@ -11,142 +11,103 @@
 # 7. HTTP response
 # 8. Title of the new page
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 import pytest
-import requests
 
-BASE_URL = "https://qaplayground.dev/apps/new-tab/"
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.scenario import play
+from helpers.site import app_url
+from helpers.snapshot import snapshot
+from helpers.windows import expect_new_window
 
-# This sets up the browser. It opens the site before the tests start and closes it after all are done.
+BASE_URL = app_url("new-tab")
+NETWORK_PROFILE = "minimal"
+
+# This borrows a warm browser from the session pool and opens the site before each test
 @pytest.fixture
-def driver():
-    options = Options()
-    options.add_argument("--start-maximized")  
+def driver(request, driver_pool):
+    with driver_pool.driver(
+        "chrome", base_url=BASE_URL, network_profile=profile_for(request), reduced_motion=reduced_motion_for(request)
+    ) as driver:
+        yield driver
 
-    driver = webdriver.Chrome(options=options)  
-    driver.get(BASE_URL)
-    yield driver
-    driver.quit()
+# Clicks through to the new tab once for the whole module, the tests below only read what it recorded
+@pytest.fixture(scope="module")
+def new_tab(request, driver_pool):
+    with driver_pool.driver(
+        "chrome", base_url=BASE_URL, network_profile=profile_for(request), reduced_motion=reduced_motion_for(request)
+    ) as driver:
+        return play(open_new_tab, driver)
 
-def test_button_is_clickable(driver):
-    wait = WebDriverWait(driver, 10)
-    button = wait.until(EC.visibility_of_element_located((By.XPATH, ".//div[@class='flex-center']/a")))
+# HELPER FUNCTIONS #
 
-    # Wait until the button is clickable
-    button = wait.until(EC.element_to_be_clickable((By.XPATH, ".//div[@class='flex-center']/a")))
+def switch_to_new_tab(driver):
+    # Click the link, the new tab's handle comes as soon as the browser opens it
+    with expect_new_window(driver) as new_tab:
+        driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
+    driver.switch_to.window(new_tab.value)
 
-    button = driver.find_element(By.XPATH, ".//div[@class='flex-center']/a")
-    assert button.is_displayed(), 'Button is not displayed'
-    assert button.is_enabled(), 'Button is not clickable'
-    
-def test_after_button_click_the_new_url_has_changed(driver):
-    # Save current window handle (old tab)
-    old_window = driver.current_window_handle
-    old_url = driver.current_url
+    # That's before the tab has left about:blank
+    WebDriverWait(driver, 10).until(lambda d: d.current_url != 'about:blank')
+
+def open_new_tab(driver, record):
+    record(old_url=driver.current_url)
 
-    # Click the link that opens a new tab
-    driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
+    switch_to_new_tab(driver)
+    record(new_url=driver.current_url, windows=len(driver.window_handles))
 
-    # Wait until a new window/tab is opened
-    WebDriverWait(driver, 10).until(EC.number_of_windows_to_be(2))
+    heading = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'h1')))
+    record(heading=heading.text)
 
-    # Get all window handles
-    windows = driver.window_handles
+    WebDriverWait(driver, 10).until(lambda d: d.title)
+    record(title=driver.title)
 
-    # Switch to the new tab (the one that's not the original)
-    for window in windows:
-        if window != old_window:
-            driver.switch_to.window(window)
-            break
+# TESTS #
 
-    # Now get the new URL from the new tab
-    new_url = driver.current_url
+def test_button_is_clickable(driver):
+    # Visibility, enabled state, text and attributes of the button in one call
+    button = snapshot(driver, {'button': (By.XPATH, ".//div[@class='flex-center']/a")})['button']
+
+    assert button is not None, 'Button is not present'
+    assert button.displayed, 'Button is not displayed'
+    assert button.enabled, 'Button is not clickable'
+    
+def test_after_button_click_the_new_url_has_changed(new_tab):
+    # URLs of the old tab before the click and of the new tab
+    old_url, new_url = new_tab.old_url, new_tab.new_url
 
     # Do the assertion
     assert old_url != new_url, "URL didn't change after clicking the button"
     
-def test_after_button_click_the_new_url_has_changed_to_what_is_required(driver, required_url_ending='/new-page'):
-    old_window = driver.current_window_handle
-
-    driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
-
-    # Wait until a new window/tab is opened
-    WebDriverWait(driver, 10).until(EC.number_of_windows_to_be(2))
-
-    # Get all window handles
-    windows = driver.window_handles
-
-    # Switch to the new tab (the one that's not the original)
-    for window in windows:
-        if window != old_window:
-            driver.switch_to.window(window)
-            break
-
-    # Now get the new URL from the new tab
-    new_url = driver.current_url
+def test_after_button_click_the_new_url_has_changed_to_what_is_required(new_tab, required_url_ending='/new-page'):
+    new_url = new_tab.new_url
 
     # Do the assertion
     assert new_url.endswith(required_url_ending), "URL didn't change after clicking the button"
 
-def test_text_on_the_new_page_is_what_is_required(driver, required_text='Welcome to the new page!'):
-    old_window = driver.current_window_handle
-
-    driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
-
-    # Wait until a new window/tab is opened
-    WebDriverWait(driver, 10).until(EC.number_of_windows_to_be(2))
-
-    # Get all window handles
-    windows = driver.window_handles
-
-    # Switch to the new tab (the one that's not the original)
-    for window in windows:
-        if window != old_window:
-            driver.switch_to.window(window)
-            break
-    
-    text = driver.find_element(By.TAG_NAME, 'h1').text
+def test_text_on_the_new_page_is_what_is_required(new_tab, required_text='Welcome to the new page!'):
+    text = new_tab.heading
 
     assert text == required_text, 'Text on the new tab is not what is supposed to be there'
 
-def test_button_has_target_attribute_with_right_assigned_parameter(driver, assigned_parameter='_blank'):
-    button = driver.find_element(By.XPATH, ".//div[@class='flex-center']/a")
+@pytest.mark.cacheable
+def test_button_has_target_attribute_with_right_assigned_parameter(dom_snapshot, assigned_parameter='_blank'):
+    # Static markup - read from the run's DOM snapshot, no browser of its own
+    button = dom_snapshot(BASE_URL).first("//div[@class='flex-center']/a")
 
-    target_value = button.get_attribute("target")
+    target_value = button.get('target')
 
     assert target_value == assigned_parameter, f'Expected target={assigned_parameter}, but got {target_value}'
 
-def test_button_opens_only_one_new_tab(driver):
-    driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
-
-    WebDriverWait(driver, 10).until(lambda d: len(d.window_handles) > 1)
-
-    windows = driver.window_handles
-
-    assert len(windows) == 2
-
-def test_https_response_is_200():
-    response = requests.get('https://qaplayground.dev/apps/new-tab/')
-
-    assert response.status_code == 200   
-
-def test_the_title_of_the_new_tab_is_what_is_expected(driver, expected_title='New Page'):
-    old_window = driver.current_window_handle
-
-    driver.find_element(By.XPATH, ".//div[@class='flex-center']/a").click()
-
-    WebDriverWait(driver, 10).until(EC.number_of_windows_to_be(2))
-
-    windows = driver.window_handles
+def test_button_opens_only_one_new_tab(new_tab):
+    assert new_tab.windows == 2
 
-    for window in windows:
-        if window != old_window:
-            driver.switch_to.window(window)
-            break
+@pytest.mark.http_check(BASE_URL)
+def test_https_response_is_200(http_response):
+    assert http_response.status_code == 200
 
-    WebDriverWait(driver, 10).until(EC.title_is(expected_title))
-    assert driver.title == expected_title, f"Unexpected title: {driver.title}"
\ No newline at end of file
+def test_the_title_of_the_new_tab_is_what_is_expected(new_tab, expected_title='New Page'):
+    assert new_tab.title == expected_title, f"Unexpected title: {new_tab.title}"
\ No newline at end of file
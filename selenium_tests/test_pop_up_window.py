@@ -19,239 +19,161 @@
 # 13. HTTPS request of a submit button is 200
 
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 import pytest
-import requests
 
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-
-BASE_URL = "https://qaplayground.dev/apps/popup/"
+from helpers.adaptive_wait import AdaptiveWait
+from helpers.dom_snapshot import text as rendered_text
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.scenario import play
+from helpers.site import app_url
+from helpers.snapshot import snapshot, wait_for_snapshot
+from helpers.windows import expect_new_window, expect_window_closed
+
+BASE_URL = app_url("popup")
+NETWORK_PROFILE = "minimal"
+pytestmark = pytest.mark.browser_matrix
 OPEN_BUTTON_XPATH = ".//div[@class='flex-center']/a"
 SUBMIT_BUTTON_XPATH = './/div/button'
 
 @pytest.fixture(params=["chrome", "firefox"])
-def driver(request):
-    browser = request.param
-    
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--start-maximized")
-        driver = webdriver.Chrome(options=options)
-    
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        options.add_argument("--start-maximized")
-        driver = webdriver.Firefox(options=options)
-    
-    else:
-        raise Exception(f"Unsupported browser: {browser}")
-
-    driver.get("https://qaplayground.dev/apps/popup/")
-
-    yield driver
-    driver.quit()
+def driver(request, driver_pool):
+    with driver_pool.driver(
+        request.param,
+        base_url=BASE_URL,
+        network_profile=profile_for(request),
+        reduced_motion=reduced_motion_for(request),
+    ) as driver:
+        yield driver
+
+# Opens the pop-up and submits it once per browser for the whole module, tests 4-11 only read what it recorded
+@pytest.fixture(scope="module", params=["chrome", "firefox"])
+def popup_flow(request, driver_pool):
+    with driver_pool.driver(
+        request.param,
+        base_url=BASE_URL,
+        network_profile=profile_for(request),
+        reduced_motion=reduced_motion_for(request),
+    ) as driver:
+        return play(open_and_submit_popup, driver)
 
 # HELPER FUNCTIONS #
 
 def click_open_popup(driver):
     driver.find_element(By.XPATH, OPEN_BUTTON_XPATH).click()
 
-def wait_for_new_window(driver, wait, expected_count=2):
-    wait.until(lambda d: len(d.window_handles) == expected_count)
-
-def switch_to_new_window(driver, old_window):
-    for window in driver.window_handles:
-        if window != old_window:
-            driver.switch_to.window(window)
-            return window
+def open_popup(driver):
+    # Returns the pop-up's handle as soon as the browser reports the new window
+    with expect_new_window(driver) as popup:
+        click_open_popup(driver)
+    return popup.value
 
 def click_submit(driver, wait):
     wait.until(EC.element_to_be_clickable((By.XPATH, SUBMIT_BUTTON_XPATH)))
     driver.find_element(By.XPATH, SUBMIT_BUTTON_XPATH).click()
 
-# TESTS #
+def submit_and_wait_for_close(driver, wait):
+    with expect_window_closed(driver):
+        click_submit(driver, wait)
 
-def test_main_text_is_what_is_expected(driver, expected_text="Click to open pop-up"):
-    text = driver.find_element(By.XPATH, ".//div[@class='flex-center']/p").text
+def open_and_submit_popup(driver, record):
+    wait = AdaptiveWait(driver, 10)
+    main_window = driver.current_window_handle
 
-    assert text == expected_text, f'Real text is {text}, while has to be {expected_text}'
+    popup = open_popup(driver)
+    record(main_url=driver.current_url, windows_with_popup=len(driver.window_handles))
 
-def test_open_button_is_clickable(driver):
-    wait = WebDriverWait(driver, 10)
+    driver.switch_to.window(popup)
+    # The window is reported as soon as it exists, it can still be on about:blank for a moment
+    wait.until(lambda d: d.current_url != 'about:blank')
+    record(popup_url=driver.current_url, popup_size=driver.get_window_size())
 
-    wait.until(EC.element_to_be_clickable((By.XPATH, OPEN_BUTTON_XPATH)))
-    wait.until(EC.visibility_of_element_located((By.XPATH, OPEN_BUTTON_XPATH)))
+    # The pop-up can still be loading, so snapshot until the button is there
+    record(submit_button=wait_for_snapshot(wait, {'button': (By.XPATH, SUBMIT_BUTTON_XPATH)})['button'])
 
-    button = driver.find_element(By.XPATH, OPEN_BUTTON_XPATH)
+    submit_and_wait_for_close(driver, wait)
+    record(windows_after_submit=len(driver.window_handles))
 
-    assert button.is_displayed(), 'Button is not displayed'
-    assert button.is_enabled(), 'Button is not clickable'
+    driver.switch_to.window(main_window)
+    record(main_text=driver.find_element(By.XPATH, ".//div[@class='flex-center']/p").text)
 
-def test_open_button_text_is_what_is_expected(driver, expected_text="OPEN"):
-    text = driver.find_element(By.XPATH, OPEN_BUTTON_XPATH).text
+# TESTS #
+
+@pytest.mark.cacheable
+def test_main_text_is_what_is_expected(dom_snapshot, expected_text="Click to open pop-up"):
+    text = rendered_text(dom_snapshot(BASE_URL).first(".//div[@class='flex-center']/p"))
 
     assert text == expected_text, f'Real text is {text}, while has to be {expected_text}'
 
-def test_the_new_window_is_opened_as_separate_window(driver):
-    # Click the button
-    # Wait till the new window appears
-    # Switch to a new window
-    # Check that its actually a separate window
-    wait = WebDriverWait(driver, 10)
-    old_window = driver.current_window_handle
+def test_open_button_is_clickable(driver):
+    button = snapshot(driver, {'button': (By.XPATH, OPEN_BUTTON_XPATH)})['button']
 
-    click_open_popup(driver)
+    assert button is not None, 'Button is not present'
+    assert button.displayed, 'Button is not displayed'
+    assert button.enabled, 'Button is not clickable'
 
-    wait_for_new_window(driver, wait, 2)
+@pytest.mark.cacheable
+def test_open_button_text_is_what_is_expected(dom_snapshot, expected_text="OPEN"):
+    # Rendered text, so the button's text-transform is applied like in WebElement.text
+    text = rendered_text(dom_snapshot(BASE_URL).first(OPEN_BUTTON_XPATH))
 
-    switch_to_new_window(driver, old_window)
+    assert text == expected_text, f'Real text is {text}, while has to be {expected_text}'
 
-    size = driver.get_window_size()
+def test_the_new_window_is_opened_as_separate_window(popup_flow):
+    # Check that the pop-up is actually a separate window
+    size = popup_flow.popup_size
 
     assert size['width'] <= 800, 'The new opened window is likely not a pop-up'
 
-def test_no_duplicate_windows_are_opened(driver):
-
-    click_open_popup(driver)
-
-    WebDriverWait(driver, 10).until(lambda d: len(d.window_handles) > 1)
+def test_no_duplicate_windows_are_opened(popup_flow):
+    assert popup_flow.windows_with_popup == 2, 'Duplicate windows have been opened'
 
-    windows = driver.window_handles
+def test_submit_button_is_clickable(popup_flow):
+    button = popup_flow.submit_button
 
-    assert len(windows) == 2, 'Duplicate windows have been opened'
+    assert button.displayed, 'Button is not displayed'
+    assert button.enabled, 'Button is not clickable'
 
-def test_submit_button_is_clickable(driver):
-    wait = WebDriverWait(driver, 10)
-    old_window = driver.current_window_handle
-    
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    switch_to_new_window(driver, old_window)
-
-    wait.until(EC.element_to_be_clickable((By.XPATH, SUBMIT_BUTTON_XPATH)))
-    wait.until(EC.visibility_of_element_located((By.XPATH, SUBMIT_BUTTON_XPATH)))
-
-    button = driver.find_element(By.XPATH, SUBMIT_BUTTON_XPATH)
-
-    assert button.is_displayed(), 'Button is not displayed'
-    assert button.is_enabled(), 'Button is not clickable'
-
-def test_submit_button_text_is_what_is_expected(driver, expected_text="Submit"):
-    wait = WebDriverWait(driver, 10)
-    old_window = driver.current_window_handle
-    
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    switch_to_new_window(driver, old_window)
-
-    text = driver.find_element(By.XPATH, SUBMIT_BUTTON_XPATH).text
+def test_submit_button_text_is_what_is_expected(popup_flow, expected_text="Submit"):
+    text = popup_flow.submit_button.text
 
     assert text == expected_text, f'Real text is {text}, while has to be {expected_text}'
 
-def test_submit_button_closes_the_pop_up_window(driver):
-    wait = WebDriverWait(driver, 10)
-
-    # Assigning variables for the old page to use later
-    old_window = driver.current_window_handle
-    
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    # Get new variable for the list of windows
-    new_windows = driver.window_handles
-
-    switch_to_new_window(driver, old_window)
-
-    click_submit(driver, wait)
-
-    wait_for_new_window(driver, wait, 1)
-
-    # Check that amount of windows is new amount minus 1
-    assert len(driver.window_handles) == len(new_windows) - 1, 'Window was not closed'
+def test_submit_button_closes_the_pop_up_window(popup_flow):
+    # Check that amount of windows is the amount with the pop-up minus 1
+    assert popup_flow.windows_after_submit == popup_flow.windows_with_popup - 1, 'Window was not closed'
 
 # 9. Text on the main page is updated
-def test_text_on_the_main_page_is_what_is_expected(driver, expected_text='Button Clicked'):
-    wait = WebDriverWait(driver, 10)
-
-    # Assigning variables for the old page to use later
-    old_window = driver.current_window_handle
-    
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    switch_to_new_window(driver, old_window)
-
-    # Assign variables of the pop-up window
-    new_window = driver.current_window_handle
-
-    click_submit(driver, wait)
-
-    wait_for_new_window(driver, wait, 1)
-
-    # Switch back to the original window
-    switch_to_new_window(driver, new_window)
-
-    # Check the text
-    text = driver.find_element(By.XPATH, ".//div[@class='flex-center']/p").text
+def test_text_on_the_main_page_is_what_is_expected(popup_flow, expected_text='Button Clicked'):
+    # Text of the main page after the pop-up was submitted
+    text = popup_flow.main_text
 
     assert text == expected_text, f'Real text is {text}, while has to be {expected_text}'
 
 # 10. URL of the main page is changed to the one that ends with "/#"
-def test_URL_of_the_main_page_is_changed_to_what_is_expected(driver, expected_url_ending='/#'):
-    wait = WebDriverWait(driver, 10)
-
-    original_url = driver.current_url
-
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    assert driver.current_url.endswith(expected_url_ending), (
-        f"Real URL is {driver.current_url}, "
-        f"but has to be {original_url + expected_url_ending}"
+def test_URL_of_the_main_page_is_changed_to_what_is_expected(popup_flow, expected_url_ending='/#'):
+    assert popup_flow.main_url.endswith(expected_url_ending), (
+        f"Real URL is {popup_flow.main_url}, "
+        f"but has to be {BASE_URL + expected_url_ending.lstrip('/')}"
     )
 
 # 11. URL of the pop-up page is what is expected
-def test_URL_of_the_pop_up_page_is_changed_to_what_is_expected(driver, expected_url_ending='/popup'):
-    wait = WebDriverWait(driver, 10)
-    
-    old_window = driver.current_window_handle
-    original_url = driver.current_url
-
-    click_open_popup(driver)
-
-    wait_for_new_window(driver, wait, 2)
-
-    windows = driver.window_handles
-    
-    switch_to_new_window(driver, old_window)
-        
-    real_url = driver.current_url
-    
+def test_URL_of_the_pop_up_page_is_changed_to_what_is_expected(popup_flow, expected_url_ending='/popup'):
+    real_url = popup_flow.popup_url
+
     assert real_url.endswith(expected_url_ending), (
         f"Real URL is {real_url}, "
-        f"but has to be {original_url + expected_url_ending}"
+        f"but has to be {BASE_URL + expected_url_ending.lstrip('/')}"
     )
 
 # 12. HTTPS request of an open button is 200
-def test_HTTPS_request_of_open_button_is_200():
-    response = requests.get('https://qaplayground.dev/apps/popup/')
-
-    assert response.status_code == 200  
+@pytest.mark.http_check(BASE_URL)
+def test_HTTPS_request_of_open_button_is_200(http_response):
+    assert http_response.status_code == 200
 
 # 13. HTTPS request of a submit button is 200
-def test_HTTPS_request_of_submit_button_is_200():
-    response = requests.get('https://qaplayground.dev/apps/popup/popup')
-
-    assert response.status_code == 200
+@pytest.mark.http_check(BASE_URL + 'popup')
+def test_HTTPS_request_of_submit_button_is_200(http_response):
+    assert http_response.status_code == 200
@@ -26,59 +26,48 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException
 import pytest
-import time
 
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-
-BASE_URL = "https://qaplayground.dev/apps/shadow-dom/"
+from helpers.clock import install_clock
+from helpers.dom_snapshot import text
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.shadow import shadow_find, shadow_query
+from helpers.site import app_url
+
+BASE_URL = app_url("shadow-dom")
+NETWORK_PROFILE = "minimal"
+pytestmark = pytest.mark.browser_matrix
+BUTTON = "progress-bar >>> button"
+# The same places in the DOM snapshot, where the shadow tree sits under <shadow-root>
+SHADOW_ROOT_XPATH = "//progress-bar/shadow-root"
+BUTTON_XPATH = SHADOW_ROOT_XPATH + "//button"
 
 @pytest.fixture(params=["chrome", "firefox"])
-def driver(request) -> webdriver.Chrome | webdriver.Firefox: # type: ignore
-    browser = request.param
-
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.add_argument("--headless")
-        driver = webdriver.Chrome(options=options)
-
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        options.add_argument("--start-maximized")
-        options.add_argument("--headless")
-        driver = webdriver.Firefox(options=options)
-
-    else:
-        raise Exception(f"Unsupported browser: {browser}")
-
-    driver.get(BASE_URL)
-    yield driver
-    driver.quit()
+def driver(request, driver_pool) -> webdriver.Chrome | webdriver.Firefox: # type: ignore
+    with driver_pool.driver(
+        request.param,
+        headless=True,
+        base_url=BASE_URL,
+        network_profile=profile_for(request),
+        reduced_motion=reduced_motion_for(request),
+    ) as driver:
+        yield driver
 
 # HELPER FUNCTION #
 def get_the_button(driver):
-    # Step 1: get the shadow host
-    shadow_host = driver.find_element(By.CSS_SELECTOR, "progress-bar")
-
-    # Step 2: use JavaScript to get the shadow root
-    shadow_root = driver.execute_script("return arguments[0].shadowRoot", shadow_host)
-
-    # Step 3: find elements inside the shadow DOM
-    boost_button = shadow_root.find_element(By.CSS_SELECTOR, "button")
-
-    return boost_button
+    # Host -> shadow root -> button in one script call, cached in the page until the DOM changes
+    return shadow_find(driver, BUTTON)
 
 
 # TESTS #
 # 1. Text on the button is what is expected
-def test_button_text_is_what_is_expected(driver, expected_text='BOOST 🚀'):
-    button_text = get_the_button(driver).text
+@pytest.mark.cacheable
+def test_button_text_is_what_is_expected(dom_snapshot, expected_text='BOOST 🚀'):
+    button_text = text(dom_snapshot(BASE_URL).first(BUTTON_XPATH))
 
     assert button_text == expected_text, \
         f'The text on the button is {button_text}, but supposed to be {expected_text}'
@@ -99,8 +88,8 @@ def test_button_can_be_accessed_through_keyboard(driver, max_tabs=30):
     shadow_host = driver.find_element(By.CSS_SELECTOR, "progress-bar")
 
     for _ in range(max_tabs):
+        # Focus moves while the key event is dispatched, so there's nothing to wait for after perform()
         ActionChains(driver).send_keys(Keys.TAB).perform()
-        time.sleep(0.1)
 
         focused_element = driver.execute_script("return arguments[0].shadowRoot.activeElement", shadow_host)
         if focused_element and focused_element.tag_name == 'buttons':
@@ -110,37 +99,28 @@ def test_button_can_be_accessed_through_keyboard(driver, max_tabs=30):
         raise AssertionError("Boost button was not focusable by keyboard (Tab).")
     
 # 4. Structure - required elements inside shadow DOM exist
-def test_required_elements_inside_shadow_dom_exist(driver, divs_number=2, style_number=1):
-
-    shadow_host = driver.find_element(By.CSS_SELECTOR, "progress-bar")
-
-    shadow_root = driver.execute_script("return arguments[0].shadowRoot", shadow_host)
-
-    div_tags = driver.execute_script("""
-        return Array.from(arguments[0].shadowRoot.children).filter(e => e.tagName === 'DIV');
-    """, shadow_host)
+@pytest.mark.cacheable
+def test_required_elements_inside_shadow_dom_exist(dom_snapshot, divs_number=2, style_number=1):
+    # Direct children of the shadow root
+    dom = dom_snapshot(BASE_URL)
+    div_tags = dom.xpath(SHADOW_ROOT_XPATH + '/div')
+    style_tags = dom.xpath(SHADOW_ROOT_XPATH + '/style')
 
     assert len(div_tags) == divs_number, f'Number of div tags is {len(div_tags)}, but supposed to be {divs_number}'
 
-    style_tags = driver.execute_script("""
-        return Array.from(arguments[0].shadowRoot.children).filter(e => e.tagName === 'STYLE');
-    """, shadow_host)
-
     assert len(style_tags) == style_number, f'Number of style tags is {len(style_tags)}, but supposed to be {style_number}'
 
 # 5. Shadow DOM is open
-def test_shadow_dom_element_is_open(driver):
-    shadow_host = driver.find_element(By.CSS_SELECTOR, "progress-bar")
-    shadow_root = driver.execute_script("return arguments[0].shadowRoot", shadow_host)
+@pytest.mark.cacheable
+def test_shadow_dom_element_is_open(dom_snapshot):
+    # Only open shadow roots make it into the snapshot
+    shadow_root = dom_snapshot(BASE_URL).first(SHADOW_ROOT_XPATH)
 
     assert shadow_root is not None, "Shadow DOM is closed (cannot access it)"
 
 # 6. Style encapsulation: CSS scripts do not affect the shadow dom element
 def test_external_styles_do_not_affect_shadow_DOM_content(driver):
-    # Get button inside shadow DOM
-    button = get_the_button(driver)
-
-    original_color = driver.execute_script("return getComputedStyle(arguments[0]).color", button)
+    original_color = shadow_query(driver, color=(BUTTON, 'color'))['color'][0]
     print(original_color)
     
     # Inject global CSS into the main document
@@ -151,45 +131,53 @@ def test_external_styles_do_not_affect_shadow_DOM_content(driver):
     """)
 
     # Read its computed style
-    new_color = driver.execute_script("return getComputedStyle(arguments[0]).color", button)
+    new_color = shadow_query(driver, color=(BUTTON, 'color'))['color'][0]
 
     assert new_color == original_color, "External CSS leaked into shadow DOM!"
 
 # 7. On a button click, progress bar gets filled to 95%
+@pytest.mark.real_motion
 def test_progress_bar_gets_filled_to_95_percents_after_button_click(driver):
+    clock = install_clock(driver)
+
     get_the_button(driver).click()
 
     progress_bar = driver.find_element(By.CSS_SELECTOR, 'progress-bar')
 
-    time.sleep(10) # wait for the animation
+    clock.run_all() # the whole animation at once instead of waiting ~4.5 s for it
 
     percents_amount = progress_bar.get_attribute('percent')
 
     assert percents_amount == '95'
 
 # 8. Initially progress bar is filled on 5%
-def test_progress_bar_is_initally_filled_on_5_percents(driver):
-    progress_bar = driver.find_element(By.CSS_SELECTOR, 'progress-bar')
-    percents_amount = progress_bar.get_attribute('percent')
+@pytest.mark.cacheable
+def test_progress_bar_is_initally_filled_on_5_percents(dom_snapshot):
+    progress_bar = dom_snapshot(BASE_URL).first('//progress-bar')
+    percents_amount = progress_bar.get('percent')
 
     assert percents_amount == '5'
 
 # 9. On multiple button clicks, progress bar stays at 95%
+@pytest.mark.real_motion
 def test_progress_bar_stays_at_95_percents_after_multiple_button_clicks(driver):
+    clock = install_clock(driver)
     progress_bar = driver.find_element(By.CSS_SELECTOR, 'progress-bar')
 
     button = get_the_button(driver)
     
+    # Same clicks and pauses as with the real clock, only the pauses take no time
     button.click()
-    time.sleep(2) # wait for some time
+    clock.advance(2000) # mid-animation
     button.click()
     button.click()
-    time.sleep(2)
+    clock.advance(2000)
     button.click()
-    time.sleep(4)
+    clock.advance(4000)
     button.click()
 
-    time.sleep(2)
+    # give a late click the chance to move the bar past 95%
+    clock.run_all()
 
     percents_amount = progress_bar.get_attribute('percent')
 
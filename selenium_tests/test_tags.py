@@ -9,24 +9,25 @@
 # 3. After clicking on "Remove all" button, all tags are removed
 
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 
-BASE_URL = 'https://qaplayground.dev/apps/tags-input-box/'
+from helpers.motion import reduced_motion_for
+from helpers.network import profile_for
+from helpers.site import app_url
+
+BASE_URL = app_url('tags-input-box')
+NETWORK_PROFILE = 'minimal'
 
 @pytest.fixture
-def driver():
-    options = Options()
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(options=options)
-    driver.get(BASE_URL)
-    WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.CLASS_NAME, 'content')))
-    yield driver
-    driver.quit()
+def driver(request, driver_pool):
+    with driver_pool.driver(
+        'chrome', base_url=BASE_URL, network_profile=profile_for(request), reduced_motion=reduced_motion_for(request)
+    ) as driver:
+        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.CLASS_NAME, 'content')))
+        yield driver
 
 def test_tag_is_saved_and_displayed_after_entering_value(driver):
     previous_amount_of_elements = len(driver.find_elements(By.TAG_NAME, "li"))